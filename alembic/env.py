@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
+import re
 import sys
 from pathlib import Path
 
@@ -35,6 +36,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Partitions of reading_logs (see app.tasks.partitions) exist only in the
+# database; autogenerate would otherwise propose dropping them. The
+# parent's (id, date) primary key isn't compared: autogenerate doesn't
+# diff primary keys.
+PARTITION_TABLE = re.compile(r"^reading_logs_(legacy|default|y\d{4}m\d{2})$")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and reflected and compare_to is None:
+        return not PARTITION_TABLE.match(name)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -57,6 +71,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -80,7 +95,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,73 @@
+"""add query shape indexes
+
+Composite indexes matching how the routes actually query: everything is
+scoped by user_id, logs are listed newest first and summed over date
+ranges. On Postgres the INCLUDE columns make the summary SUM index-only,
+and the indexes are built CONCURRENTLY so writes keep flowing.
+
+Revision ID: 5c81f3a0d6e2
+Revises: e4a9d2c7f180
+Create Date: 2026-10-18 12:20:05.617342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c81f3a0d6e2'
+down_revision: Union[str, Sequence[str], None] = 'e4a9d2c7f180'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_books_user_id_id', 'books', [sa.text('user_id'), sa.text('id')], None),
+    (
+        'ix_reading_logs_user_date_id',
+        'reading_logs',
+        [sa.text('user_id'), sa.text('date DESC'), sa.text('id DESC')],
+        ['pages_read'],
+    ),
+    (
+        'ix_reading_logs_user_book_date',
+        'reading_logs',
+        [sa.text('user_id'), sa.text('book_id'), sa.text('date')],
+        ['pages_read'],
+    ),
+    ('ix_reading_logs_book_id', 'reading_logs', [sa.text('book_id')], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_include=include or [],
+                postgresql_concurrently=is_postgres,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=is_postgres,
+                if_exists=True,
+            )
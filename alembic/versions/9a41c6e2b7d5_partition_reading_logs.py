@@ -0,0 +1,157 @@
+"""partition reading_logs by month
+
+Postgres only; other databases keep the plain table.
+
+reading_logs becomes a table partitioned by RANGE (date). The existing
+table is not copied: it is attached as one "legacy" partition holding
+everything before the first of next month, so the conversion is a few
+catalog changes under a brief lock. The slow parts run beforehand without
+blocking writes:
+
+  1. build the (id, date) unique index the new primary key needs,
+     CONCURRENTLY;
+  2. add a CHECK (date < boundary) as NOT VALID and VALIDATE it, so that
+     ATTACH PARTITION can skip scanning the table.
+
+Then, in one transaction: rename the table and its indexes to *_legacy,
+create the partitioned parent with the same columns, keys and indexes
+(the legacy ones get attached rather than rebuilt), attach the legacy
+table, and create a DEFAULT partition plus the next few months.
+
+Between step 2 and the swap, inserts dated on or after the boundary are
+rejected by the CHECK; run the migration early in the month.
+
+app.tasks.partitions keeps future partitions created afterwards, and its
+retention detaches the legacy partition like a monthly one once its
+upper bound falls past the cutoff.
+
+The model keeps `id` as its primary key; see the note on ReadingLog.
+
+Revision ID: 9a41c6e2b7d5
+Revises: 5c81f3a0d6e2
+Create Date: 2026-10-18 14:02:41.118203
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a41c6e2b7d5'
+down_revision: Union[str, Sequence[str], None] = '5c81f3a0d6e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months created ahead of the boundary by the migration itself
+INITIAL_MONTHS = 3
+
+# Secondary indexes (name, definition), as created by earlier revisions
+INDEXES = [
+    ('ix_reading_logs_id', '(id)'),
+    ('ix_reading_logs_user_date_id', '(user_id, date DESC, id DESC) INCLUDE (pages_read)'),
+    ('ix_reading_logs_user_book_date', '(user_id, book_id, date) INCLUDE (pages_read)'),
+    ('ix_reading_logs_book_id', '(book_id)'),
+]
+
+
+def _month(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition(month_start: date) -> str:
+    return f'reading_logs_y{month_start.year:04d}m{month_start.month:02d}'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    boundary = _month(date.today(), 1)
+
+    # Online preparation: neither step blocks reads or writes
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS reading_logs_legacy_id_date '
+            'ON reading_logs (id, date)'
+        )
+        op.execute(
+            f"ALTER TABLE reading_logs ADD CONSTRAINT reading_logs_legacy_range "
+            f"CHECK (date < '{boundary.isoformat()}') NOT VALID"
+        )
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE reading_logs VALIDATE CONSTRAINT reading_logs_legacy_range')
+
+    # The swap: catalog-only changes
+    op.execute('ALTER TABLE reading_logs RENAME TO reading_logs_legacy')
+    op.execute(
+        'ALTER TABLE reading_logs_legacy RENAME CONSTRAINT reading_logs_pkey '
+        'TO reading_logs_legacy_pkey'
+    )
+    for name, _ in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_legacy')
+
+    op.execute(
+        'CREATE TABLE reading_logs (LIKE reading_logs_legacy INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (date)'
+    )
+    op.execute('ALTER SEQUENCE reading_logs_id_seq OWNED BY reading_logs.id')
+    op.execute('ALTER TABLE reading_logs ADD CONSTRAINT reading_logs_pkey PRIMARY KEY (id, date)')
+    op.create_foreign_key(
+        'reading_logs_user_id_fkey', 'reading_logs', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'reading_logs_book_id_fkey', 'reading_logs', 'books',
+        ['book_id'], ['id'], ondelete='CASCADE',
+    )
+    for name, definition in INDEXES:
+        op.execute(f'CREATE INDEX {name} ON reading_logs {definition}')
+
+    # Matching indexes and foreign keys on the legacy table are attached,
+    # and the validated CHECK proves the range without a scan
+    op.execute(
+        f"ALTER TABLE reading_logs ATTACH PARTITION reading_logs_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    op.execute('CREATE TABLE reading_logs_default PARTITION OF reading_logs DEFAULT')
+    for offset in range(INITIAL_MONTHS):
+        start, end = _month(boundary, offset), _month(boundary, offset + 1)
+        op.execute(
+            f"CREATE TABLE {_partition(start)} PARTITION OF reading_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Copies every row back into a plain table; not online
+    op.execute('ALTER TABLE reading_logs RENAME TO reading_logs_partitioned')
+    op.execute('ALTER TABLE reading_logs_partitioned RENAME CONSTRAINT reading_logs_pkey TO reading_logs_partitioned_pkey')
+    for name, _ in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_partitioned')
+
+    op.execute('CREATE TABLE reading_logs (LIKE reading_logs_partitioned INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO reading_logs SELECT * FROM reading_logs_partitioned')
+    op.execute('ALTER SEQUENCE reading_logs_id_seq OWNED BY reading_logs.id')
+    op.execute('ALTER TABLE reading_logs ADD CONSTRAINT reading_logs_pkey PRIMARY KEY (id)')
+    op.create_foreign_key(
+        'reading_logs_user_id_fkey', 'reading_logs', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'reading_logs_book_id_fkey', 'reading_logs', 'books',
+        ['book_id'], ['id'], ondelete='CASCADE',
+    )
+    # Drops the parent together with every partition
+    op.execute('DROP TABLE reading_logs_partitioned CASCADE')
+    for name, definition in INDEXES:
+        op.execute(f'CREATE INDEX {name} ON reading_logs {definition}')
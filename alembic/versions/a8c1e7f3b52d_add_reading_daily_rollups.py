@@ -0,0 +1,58 @@
+"""add reading_daily_rollups
+
+One row per user, book and day with the pages and number of logs behind
+them, maintained by the app with every reading_logs write. Backfilled
+here from the existing logs; `python -m app.cli rebuild-rollups` does the
+same reconciliation later.
+
+Revision ID: a8c1e7f3b52d
+Revises: f2b6c8a4d913
+Create Date: 2026-10-18 19:03:27.660418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c1e7f3b52d'
+down_revision: Union[str, Sequence[str], None] = 'f2b6c8a4d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reading_daily_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('pages', sa.Integer(), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'book_id', 'date')
+    )
+    op.execute(
+        "INSERT INTO reading_daily_rollups (user_id, book_id, date, pages, sessions) "
+        "SELECT user_id, book_id, date, SUM(pages_read), COUNT(*) "
+        "FROM reading_logs GROUP BY user_id, book_id, date"
+    )
+    # Indexes after the backfill: cheaper than maintaining them row by row
+    op.create_index(
+        'ix_reading_daily_rollups_user_date',
+        'reading_daily_rollups',
+        ['user_id', 'date'],
+        unique=False,
+        postgresql_include=['pages'],
+    )
+    op.create_index('ix_reading_daily_rollups_book_id', 'reading_daily_rollups', ['book_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reading_daily_rollups_book_id', table_name='reading_daily_rollups')
+    op.drop_index('ix_reading_daily_rollups_user_date', table_name='reading_daily_rollups')
+    op.drop_table('reading_daily_rollups')
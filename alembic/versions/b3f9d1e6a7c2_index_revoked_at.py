@@ -0,0 +1,30 @@
+"""index revoked_access_tokens.revoked_at
+
+Workers sync their revocation filters by revoked_at instead of id.
+
+Revision ID: b3f9d1e6a7c2
+Revises: a8c1e7f3b52d
+Create Date: 2026-10-19 09:14:52.318044
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f9d1e6a7c2'
+down_revision: Union[str, Sequence[str], None] = 'a8c1e7f3b52d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_revoked_access_tokens_revoked_at'), 'revoked_access_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_access_tokens_revoked_at'), table_name='revoked_access_tokens')
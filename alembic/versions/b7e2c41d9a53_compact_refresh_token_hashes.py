@@ -0,0 +1,75 @@
+"""compact refresh token hashes
+
+Store refresh token hashes as raw 32-byte digests instead of 64-char hex,
+and index only live (non-revoked) tokens.
+
+Revision ID: b7e2c41d9a53
+Revises: 1896f0901e03
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41d9a53'
+down_revision: Union[str, Sequence[str], None] = '1896f0901e03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Revoked rows are never looked up again; drop them before rewriting
+        op.execute("DELETE FROM refresh_tokens WHERE revoked_at IS NOT NULL")
+        op.execute(
+            "ALTER TABLE refresh_tokens "
+            "ALTER COLUMN token_hash TYPE BYTEA USING decode(token_hash, 'hex')"
+        )
+    else:
+        # No portable hex decode (e.g. SQLite); existing sessions must log in again
+        op.execute("DELETE FROM refresh_tokens")
+        with op.batch_alter_table('refresh_tokens') as batch_op:
+            batch_op.alter_column(
+                'token_hash',
+                existing_type=sa.String(length=128),
+                type_=sa.LargeBinary(length=32),
+                existing_nullable=False,
+            )
+
+    op.create_index(
+        'ix_refresh_tokens_live',
+        'refresh_tokens',
+        ['token_hash'],
+        unique=True,
+        postgresql_where=sa.text('revoked_at IS NULL'),
+        sqlite_where=sa.text('revoked_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_live', table_name='refresh_tokens')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE refresh_tokens "
+            "ALTER COLUMN token_hash TYPE VARCHAR(128) USING encode(token_hash, 'hex')"
+        )
+    else:
+        op.execute("DELETE FROM refresh_tokens")
+        with op.batch_alter_table('refresh_tokens') as batch_op:
+            batch_op.alter_column(
+                'token_hash',
+                existing_type=sa.LargeBinary(length=32),
+                type_=sa.String(length=128),
+                existing_nullable=False,
+            )
+
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
@@ -0,0 +1,178 @@
+"""add search indexes
+
+Postgres: pg_trgm, GIN indexes over the tsvector expressions used by
+/search and a trigram index on books.title, built CONCURRENTLY. On the
+partitioned reading_logs (where CONCURRENTLY isn't available) the index
+is created ON ONLY the parent and then built concurrently per partition
+and attached.
+
+SQLite: the FTS5 search_index table and its sync triggers, backfilled
+from the existing rows.
+
+Revision ID: c3d8e5f1a2b4
+Revises: 9a41c6e2b7d5
+Create Date: 2026-10-18 15:11:52.402977
+
+"""
+from typing import List, Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e5f1a2b4'
+down_revision: Union[str, Sequence[str], None] = '9a41c6e2b7d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Copies of the app.db.search definitions at this revision
+BOOK_DOCUMENT = (
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(author, ''))"
+)
+LOG_DOCUMENT = "to_tsvector('simple', coalesce(note, ''))"
+
+SQLITE_CREATE = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        owner, title, author, note,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS books_search_insert AFTER INSERT ON books BEGIN
+        INSERT INTO search_index (rowid, owner, title, author)
+        VALUES (new.id * 2, 'u' || new.user_id, new.title, new.author);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS books_search_update AFTER UPDATE ON books BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+        INSERT INTO search_index (rowid, owner, title, author)
+        VALUES (new.id * 2, 'u' || new.user_id, new.title, new.author);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS books_search_delete AFTER DELETE ON books BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_insert AFTER INSERT ON reading_logs BEGIN
+        INSERT INTO search_index (rowid, owner, note)
+        VALUES (new.id * 2 + 1, 'u' || new.user_id, new.note);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_update AFTER UPDATE ON reading_logs BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        INSERT INTO search_index (rowid, owner, note)
+        VALUES (new.id * 2 + 1, 'u' || new.user_id, new.note);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_delete AFTER DELETE ON reading_logs BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    END
+    ''',
+]
+
+SQLITE_BACKFILL = [
+    '''
+    INSERT INTO search_index (rowid, owner, title, author)
+    SELECT id * 2, 'u' || user_id, title, author FROM books
+    ''',
+    '''
+    INSERT INTO search_index (rowid, owner, note)
+    SELECT id * 2 + 1, 'u' || user_id, note FROM reading_logs
+    ''',
+]
+
+SQLITE_TRIGGERS = [
+    'books_search_insert',
+    'books_search_update',
+    'books_search_delete',
+    'reading_logs_search_insert',
+    'reading_logs_search_update',
+    'reading_logs_search_delete',
+]
+
+
+def _partitions(table: str) -> Optional[List[str]]:
+    """
+    Partitions of `table`; None when generating SQL offline (unknown).
+    """
+    if context.is_offline_mode():
+        return None
+    return op.get_bind().execute(
+        sa.text(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = CAST(:table AS regclass)'
+        ),
+        {'table': table},
+    ).scalars().all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for statement in SQLITE_CREATE + SQLITE_BACKFILL:
+            op.execute(statement)
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    partitions = _partitions('reading_logs')
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_search '
+            f'ON books USING gin ({BOOK_DOCUMENT})'
+        )
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_title_trgm '
+            'ON books USING gin (title gin_trgm_ops)'
+        )
+
+        if partitions is None:
+            # Offline: works for both plain and partitioned tables, but locks
+            op.execute(
+                f'CREATE INDEX IF NOT EXISTS ix_reading_logs_search '
+                f'ON reading_logs USING gin ({LOG_DOCUMENT})'
+            )
+            return
+
+        if not partitions:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reading_logs_search '
+                f'ON reading_logs USING gin ({LOG_DOCUMENT})'
+            )
+            return
+
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_reading_logs_search '
+            f'ON ONLY reading_logs USING gin ({LOG_DOCUMENT})'
+        )
+        for partition in partitions:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_search '
+                f'ON {partition} USING gin ({LOG_DOCUMENT})'
+            )
+            op.execute(f'ALTER INDEX ix_reading_logs_search ATTACH PARTITION {partition}_search')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS search_index')
+        return
+
+    # Dropping the parent index drops the attached partition indexes too
+    op.drop_index('ix_reading_logs_search', table_name='reading_logs', if_exists=True)
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_books_title_trgm')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_books_search')
@@ -0,0 +1,37 @@
+"""add user_data_versions
+
+Per-user counter bumped by every write to the user's books and reading
+logs; read endpoints derive their ETags from it. Rows are created on the
+first write (a missing row means version 0).
+
+Revision ID: d7f4a9b2c6e1
+Revises: c3d8e5f1a2b4
+Create Date: 2026-10-18 16:40:08.539112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f4a9b2c6e1'
+down_revision: Union[str, Sequence[str], None] = 'c3d8e5f1a2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_data_versions')
@@ -0,0 +1,53 @@
+"""add account deletions
+
+users.disabled_at marks accounts deleted through DELETE /auth/me;
+account_deletions tracks the background purge of their data. On SQLite
+users is rebuilt with AUTOINCREMENT so purged ids are never reused
+(Postgres sequences never reuse them anyway).
+
+Revision ID: f2b6c8a4d913
+Revises: d7f4a9b2c6e1
+Create Date: 2026-10-18 18:12:44.107215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6c8a4d913'
+down_revision: Union[str, Sequence[str], None] = 'd7f4a9b2c6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    disabled_at = sa.Column('disabled_at', sa.DateTime(timezone=True), nullable=True)
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table(
+            'users', recreate='always', table_kwargs={'sqlite_autoincrement': True}
+        ) as batch_op:
+            batch_op.add_column(disabled_at)
+    else:
+        op.add_column('users', disabled_at)
+    op.create_table('account_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('requested_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('reading_logs_deleted', sa.Integer(), nullable=False),
+    sa.Column('books_deleted', sa.Integer(), nullable=False),
+    sa.Column('refresh_tokens_deleted', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('account_deletions')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('disabled_at')
@@ -0,0 +1,103 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli purge-refresh-tokens [--retention-days N] [--batch-size N]
+    python -m app.cli purge-deleted-accounts [--batch-size N]
+    python -m app.cli rebuild-rollups [--user-id N]
+    python -m app.cli ensure-partitions [--months-ahead N]
+    python -m app.cli detach-partitions --older-than-months N [--drop]
+"""
+import argparse
+from typing import List, Optional
+
+from app.db.session import SessionLocal, engine
+from app.tasks.accounts import purge_deleted_accounts
+from app.tasks.partitions import (
+    detach_reading_log_partitions,
+    ensure_reading_log_partitions,
+)
+from app.tasks.rollups import rebuild_reading_rollups
+from app.tasks.tokens import purge_refresh_tokens, purge_revoked_access_tokens
+
+
+def _purge_refresh_tokens(args: argparse.Namespace) -> None:
+    deleted = purge_refresh_tokens(
+        SessionLocal,
+        retention_days=args.retention_days,
+        batch_size=args.batch_size,
+    )
+    print(f"Deleted {deleted} refresh tokens.")
+    deleted = purge_revoked_access_tokens(SessionLocal)
+    print(f"Deleted {deleted} expired access-token revocations.")
+
+
+def _purge_deleted_accounts(args: argparse.Namespace) -> None:
+    purged = purge_deleted_accounts(SessionLocal, batch_size=args.batch_size)
+    print(f"Purged {purged} deleted accounts.")
+
+
+def _rebuild_rollups(args: argparse.Namespace) -> None:
+    corrected = rebuild_reading_rollups(SessionLocal, user_id=args.user_id)
+    print(f"Corrected {corrected} reading rollup rows.")
+
+
+def _ensure_partitions(args: argparse.Namespace) -> None:
+    created = ensure_reading_log_partitions(engine, months_ahead=args.months_ahead)
+    print(f"Created {len(created)} partitions.")
+
+
+def _detach_partitions(args: argparse.Namespace) -> None:
+    detached = detach_reading_log_partitions(
+        engine, older_than_months=args.older_than_months, drop=args.drop
+    )
+    print(f"Detached {len(detached)} partitions.")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    purge = commands.add_parser(
+        "purge-refresh-tokens",
+        help="Delete stale refresh tokens and expired access-token revocations.",
+    )
+    purge.add_argument("--retention-days", type=int, default=None)
+    purge.add_argument("--batch-size", type=int, default=None)
+    purge.set_defaults(func=_purge_refresh_tokens)
+
+    accounts = commands.add_parser(
+        "purge-deleted-accounts",
+        help="Remove the data of accounts deleted through DELETE /auth/me.",
+    )
+    accounts.add_argument("--batch-size", type=int, default=None)
+    accounts.set_defaults(func=_purge_deleted_accounts)
+
+    rollups = commands.add_parser(
+        "rebuild-rollups",
+        help="Recompute daily reading rollups from reading_logs and fix any drift.",
+    )
+    rollups.add_argument("--user-id", type=int, default=None)
+    rollups.set_defaults(func=_rebuild_rollups)
+
+    ensure = commands.add_parser(
+        "ensure-partitions",
+        help="Create upcoming monthly reading_logs partitions (Postgres).",
+    )
+    ensure.add_argument("--months-ahead", type=int, default=None)
+    ensure.set_defaults(func=_ensure_partitions)
+
+    detach = commands.add_parser(
+        "detach-partitions",
+        help="Detach monthly reading_logs partitions older than N months (Postgres).",
+    )
+    detach.add_argument("--older-than-months", type=int, required=True)
+    detach.add_argument("--drop", action="store_true", help="Drop them after detaching.")
+    detach.set_defaults(func=_detach_partitions)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Reading analytics over the daily rollups.
+
+The analytics endpoint fetches the user's reading_daily_rollups rows for
+the range as columns in one query; everything here works on those NumPy
+arrays, so a year of daily buckets across every book is a few vectorised
+passes rather than a Python loop per log.
+"""
+from datetime import date
+from typing import Dict, Sequence
+
+import numpy as np
+
+BUCKETS = ("day", "week", "month")
+GROUPS = ("book", "author")
+# Projected finish dates assume the pace of the last PACE_DAYS days
+PACE_DAYS = 28
+
+
+def to_columns(rows: Sequence[tuple], dtypes: Sequence[str]) -> list:
+    """
+    Transpose result rows into one array per column.
+    """
+    if not rows:
+        return [np.array([], dtype=dtype) for dtype in dtypes]
+    return [np.array(column, dtype=dtype) for column, dtype in zip(zip(*rows), dtypes)]
+
+
+def bucket_starts(days: np.ndarray, bucket: str) -> np.ndarray:
+    """
+    First day of the bucket each day falls in (weeks start on Monday).
+    """
+    if bucket == "week":
+        # Day 0 of datetime64 (1970-01-01) was a Thursday
+        return days - (days.astype(np.int64) + 3) % 7
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days
+
+
+def bucket_axis(date_from: date, date_to: date, bucket: str) -> np.ndarray:
+    """
+    Start of every bucket in the range, empty ones included.
+    """
+    first, last = bucket_starts(np.array([date_from, date_to], dtype="datetime64[D]"), bucket)
+    if bucket == "month":
+        months = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1)
+        return months.astype("datetime64[D]")
+    step = np.timedelta64(7 if bucket == "week" else 1, "D")
+    return np.arange(first, last + 1, step)
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over the last `window` buckets of each row (over fewer
+    at the start).
+    """
+    totals = np.cumsum(values, axis=-1, dtype=np.float64)
+    before = np.zeros_like(totals)
+    before[..., window:] = totals[..., :-window]
+    counts = np.minimum(np.arange(1, values.shape[-1] + 1), window)
+    return (totals - before) / counts
+
+
+def reading_series(
+    days: np.ndarray,
+    groups: np.ndarray,
+    group_count: int,
+    pages: np.ndarray,
+    sessions: np.ndarray,
+    date_from: date,
+    date_to: date,
+    bucket: str,
+    window: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Bucketed series per group from rollup columns (`days` as
+    datetime64[D], `groups` the group index of each row, all within the
+    range). Matrices are groups x buckets.
+    """
+    axis = bucket_axis(date_from, date_to, bucket)
+    shape = (group_count, len(axis))
+    cells = groups * len(axis) + np.searchsorted(axis, bucket_starts(days, bucket))
+
+    page_matrix = np.bincount(cells, weights=pages, minlength=shape[0] * shape[1])
+    page_matrix = page_matrix.reshape(shape).astype(np.int64)
+    session_matrix = np.bincount(cells, weights=sessions, minlength=shape[0] * shape[1])
+    session_matrix = session_matrix.reshape(shape).astype(np.int64)
+
+    # Distinct days per group (books of one author can share a day)
+    span = (date_to - date_from).days + 1
+    offsets = (days - np.datetime64(date_from, "D")).astype(np.int64)
+    group_days = np.unique(groups * span + offsets)
+    active_days = np.bincount(group_days // span, minlength=group_count)
+
+    totals = page_matrix.sum(axis=1)
+    return {
+        "buckets": axis,
+        "pages": page_matrix,
+        "sessions": session_matrix,
+        "moving_average": moving_average(page_matrix, window),
+        "total_pages": totals,
+        "active_days": active_days,
+        "pages_per_day": totals / span,
+        "pages_per_active_day": totals / np.maximum(active_days, 1),
+    }
+
+
+def project_finish(
+    pages_read: np.ndarray,
+    total_pages: np.ndarray,
+    recent_pages: np.ndarray,
+    pace_days: int = PACE_DAYS,
+) -> Dict[str, np.ndarray]:
+    """
+    Days until each book is finished at its recent pace (NaN when there
+    is no recent reading).
+    """
+    remaining = np.maximum(total_pages - pages_read, 0)
+    pace = recent_pages / pace_days
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(pace > 0, np.ceil(remaining / pace), np.nan)
+    return {"remaining_pages": remaining, "pages_per_day": pace, "days_left": days_left}
@@ -13,6 +13,16 @@ def _split_csv(value: str) -> List[str]:
     return [v.strip() for v in value.split(",") if v.strip()]
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean env var ("1", "true", "yes", "on" are true).
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 
 
 class Settings:
@@ -25,6 +35,42 @@ class Settings:
         self.DATABASE_URL: str = os.getenv("DATABASE_URL", "")
         if not self.DATABASE_URL:
             raise ValueError("DATABASE_URL is not set in the environment variables")
+
+        # Connection pool (ignored for SQLite)
+        self.DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # Seconds before a connection is replaced; -1 keeps them forever
+        self.DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", True)
+        # Behind PgBouncer (transaction pooling): no server-side prepared statements
+        self.DB_PGBOUNCER: bool = _env_bool("DB_PGBOUNCER", False)
+
+        # /health/ready is served from a probe refreshed this often
+        self.HEALTH_PROBE_INTERVAL_SECONDS: float = float(
+            os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "2")
+        )
+
+        # Query instrumentation: log statements slower than this (0 = off)
+        self.SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+        # A statement repeated this many times in one request is logged as N+1
+        self.N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+        # Read replicas (comma-separated URLs) for read-only routes
+        replicas_raw = os.getenv("DATABASE_REPLICA_URLS", "")
+        self.DATABASE_REPLICA_URLS: List[str] = (
+            _split_csv(replicas_raw) if replicas_raw else []
+        )
+        # After writing, a user reads from the primary for this long
+        self.REPLICA_STICKY_SECONDS: int = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+        # A replica that failed to connect is skipped for this long
+        self.REPLICA_RETRY_SECONDS: int = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+        # Async mode: routes run on the event loop over an AsyncEngine
+        # (asyncpg / aiosqlite) instead of the anyio threadpool
+        self.DB_ASYNC: bool = _env_bool("DB_ASYNC", False)
+        # Defaults to DATABASE_URL with the matching async driver
+        self.ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
         
 
         # Auth / JWT
@@ -33,6 +79,12 @@ class Settings:
             # You can allow blank in local, but I recommend always setting it.
             raise ValueError("SECRET_KEY is not set in the environment variables")
         self.ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
+        # Asymmetric algorithms (RS256, ES256, ...) sign with PEM keys from here
+        self.JWT_KEYS_DIR: str = os.getenv("JWT_KEYS_DIR", "")
+        self.JWT_ACTIVE_KID: str = os.getenv("JWT_ACTIVE_KID", "")
+        self.JWKS_CACHE_MAX_AGE_SECONDS: int = int(
+            os.getenv("JWKS_CACHE_MAX_AGE_SECONDS", "300")
+        )
         self.ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
             os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
         )
@@ -40,6 +92,96 @@ class Settings:
         self.REFRESH_TOKEN_EXPIRE_DAYS: int = int(
             os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14")
         )
+        # Expired/revoked refresh tokens are purged after this many days
+        self.REFRESH_TOKEN_RETENTION_DAYS: int = int(
+            os.getenv("REFRESH_TOKEN_RETENTION_DAYS", "7")
+        )
+        # 0 disables the background purge (use `python -m app.cli` instead)
+        self.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: int = int(
+            os.getenv("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", "3600")
+        )
+        self.REFRESH_TOKEN_PURGE_BATCH_SIZE: int = int(
+            os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "1000")
+        )
+        self.REFRESH_TOKEN_PURGE_PAUSE_SECONDS: float = float(
+            os.getenv("REFRESH_TOKEN_PURGE_PAUSE_SECONDS", "0.1")
+        )
+
+        # Deleted accounts: how often the purge looks for pending ones
+        # (0 disables it; use `python -m app.cli purge-deleted-accounts`),
+        # rows per batch (one transaction each) and the pause between batches
+        self.ACCOUNT_PURGE_INTERVAL_SECONDS: int = int(
+            os.getenv("ACCOUNT_PURGE_INTERVAL_SECONDS", "60")
+        )
+        self.ACCOUNT_PURGE_BATCH_SIZE: int = int(
+            os.getenv("ACCOUNT_PURGE_BATCH_SIZE", "1000")
+        )
+        self.ACCOUNT_PURGE_PAUSE_SECONDS: float = float(
+            os.getenv("ACCOUNT_PURGE_PAUSE_SECONDS", "0.1")
+        )
+
+        # reading_logs partitions (Postgres): months created ahead, and
+        # monthly partitions older than this many months are detached
+        # (0 = keep everything)
+        self.READING_LOG_PARTITIONS_AHEAD: int = int(
+            os.getenv("READING_LOG_PARTITIONS_AHEAD", "3")
+        )
+        self.READING_LOG_RETENTION_MONTHS: int = int(
+            os.getenv("READING_LOG_RETENTION_MONTHS", "0")
+        )
+        # 0 disables the background maintenance
+        self.PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = int(
+            os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "86400")
+        )
+
+        # Bulk imports: rows per insert batch (and transaction), and how
+        # many row errors are reported back in full
+        self.IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+        self.IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+        # Password hashing (runs in a separate process pool)
+        self.PASSWORD_HASHER: str = os.getenv("PASSWORD_HASHER", "bcrypt")  # bcrypt | argon2
+        # Explicit cost factor; 0 = scheme default, or autotuned if a target is set
+        self.PASSWORD_HASH_COST: int = int(os.getenv("PASSWORD_HASH_COST", "0"))
+        # Pick the cost at startup so one hash takes about this long (0 = off)
+        self.PASSWORD_HASH_TARGET_MS: int = int(os.getenv("PASSWORD_HASH_TARGET_MS", "0"))
+        self.PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+        self.PASSWORD_HASH_QUEUE_SIZE: int = int(
+            os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16")
+        )
+        self.PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(
+            os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "1")
+        )
+
+        # Rate limiting (token buckets, "N/S" = N requests per S seconds)
+        self.RATE_LIMIT_ENABLED: bool = _env_bool("RATE_LIMIT_ENABLED", True)
+        # "memory" (per worker) or "sqlite:///path" (shared by workers on a host)
+        self.RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+        self.RATE_LIMIT_AUTH_PER_IP: str = os.getenv("RATE_LIMIT_AUTH_PER_IP", "30/60")
+        self.RATE_LIMIT_AUTH_PER_EMAIL: str = os.getenv(
+            "RATE_LIMIT_AUTH_PER_EMAIL", "10/60"
+        )
+        self.RATE_LIMIT_PER_USER: str = os.getenv("RATE_LIMIT_PER_USER", "300/60")
+
+        # Access-token revocation (Bloom filter synced from the database)
+        self.REVOCATION_SYNC_INTERVAL_SECONDS: float = float(
+            os.getenv("REVOCATION_SYNC_INTERVAL_SECONDS", "2")
+        )
+        self.REVOCATION_REBUILD_SECONDS: int = int(
+            os.getenv("REVOCATION_REBUILD_SECONDS", "3600")
+        )
+        self.REVOCATION_FILTER_CAPACITY: int = int(
+            os.getenv("REVOCATION_FILTER_CAPACITY", "100000")
+        )
+        self.REVOCATION_FILTER_ERROR_RATE: float = float(
+            os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001")
+        )
+
+        # Authenticated-principal cache used by get_current_user
+        self.PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+        self.PRINCIPAL_CACHE_TTL_SECONDS: int = int(
+            os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")
+        )
 
 # Single global settings instance
 settings = Settings()
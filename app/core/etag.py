@@ -0,0 +1,78 @@
+"""
+Conditional GETs driven by a per-user data version.
+
+user_data_versions.version is bumped in the same transaction as every
+write to the user's books and reading logs (bump_data_version). Read endpoints
+derive a weak ETag from it plus the request URL, and answer a matching
+If-None-Match with 304 after one primary-key lookup, before running
+their query.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Call first in every write to the user's books or logs, before reading
+    anything the write depends on. The upsert locks the user's version row
+    until commit, so it also serialises the user's writers (and the
+    rollup rebuild) in one lock order.
+    """
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    table = models.UserDataVersion.__table__
+    db.execute(
+        insert(table)
+        .values(user_id=user_id, version=1)
+        .on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"version": table.c.version + 1},
+        )
+    )
+
+
+def make_etag(request: Request, user_id: int, version: int, vary: str = "") -> str:
+    # Each URL (path, filters, page) is its own representation
+    url = f"{user_id}:{request.url.path}?{request.url.query}#{vary}"
+    digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    db: Session,
+    user_id: int,
+    vary: str = "",
+) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's copy is current. Otherwise
+    sets ETag / Cache-Control on `response` and returns None. `vary` adds
+    inputs the URL doesn't carry (e.g. a range defaulting to today).
+    """
+    version = db.scalar(
+        select(models.UserDataVersion.version).where(models.UserDataVersion.user_id == user_id)
+    )
+    etag = make_etag(request, user_id, version or 0, vary)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,258 @@
+"""
+Password hashing, run off the request threadpool.
+
+bcrypt is deliberately slow. Calling it inline from a sync handler keeps an
+anyio worker thread (and the GIL) busy for the whole hash, so a burst of
+logins starves every other endpoint that shares the threadpool. Hashes are
+sent to a small process pool instead, and the number of jobs that may be
+running or waiting at once is capped: past that point callers are turned
+away immediately instead of queueing behind each other.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashPoolFull(Exception):
+    """
+    Raised when every slot of the hashing pool is taken.
+    """
+
+
+# ----- Hasher registry -----
+
+
+@dataclass(frozen=True)
+class Hasher:
+    """
+    A passlib scheme plus the setting that controls its cost.
+    """
+    scheme: str
+    cost_setting: str
+    min_cost: int
+    max_cost: int
+    default_cost: int
+
+
+HASHERS: Dict[str, Hasher] = {
+    # cost = log2(rounds)
+    "bcrypt": Hasher("bcrypt", "rounds", min_cost=4, max_cost=16, default_cost=12),
+    # cost = iterations; needs the optional argon2-cffi package
+    "argon2": Hasher("argon2", "time_cost", min_cost=1, max_cost=10, default_cost=3),
+}
+
+
+def build_context(name: str, cost: int) -> CryptContext:
+    """
+    CryptContext hashing with `name` at `cost`.
+
+    Every other registered scheme is kept (deprecated) so existing hashes
+    still verify and are flagged by needs_update. Hashes of the active
+    scheme below `cost` are flagged too; stronger ones are left alone.
+    """
+    if name not in HASHERS:
+        raise ValueError(f"Unknown password hasher: {name!r}")
+    hasher = HASHERS[name]
+    others = [h.scheme for key, h in HASHERS.items() if key != name]
+
+    return CryptContext(
+        schemes=[hasher.scheme] + others,
+        deprecated="auto",
+        **{
+            f"{hasher.scheme}__{hasher.cost_setting}": cost,
+            f"{hasher.scheme}__min_{hasher.cost_setting}": cost,
+        },
+    )
+
+
+def autotune_cost(name: str, target_ms: float) -> int:
+    """
+    Benchmark `name` on this machine and return the highest cost whose
+    hash still takes at most `target_ms` (never below the scheme minimum).
+    """
+    hasher = HASHERS[name]
+    chosen = hasher.min_cost
+    for cost in range(hasher.min_cost, hasher.max_cost + 1):
+        context = build_context(name, cost)
+        started = time.perf_counter()
+        context.hash("benchmark-password")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        chosen = cost
+    return chosen
+
+
+# These run inside the worker processes, so they must be importable
+# module-level functions. The context is shipped as its config string.
+
+
+@lru_cache(maxsize=8)
+def _context_from_string(config: str) -> CryptContext:
+    return CryptContext.from_string(config)
+
+
+def _hash(config: str, password: str) -> str:
+    return _context_from_string(config).hash(password)
+
+
+def _verify(config: str, password: str, hashed_password: str) -> bool:
+    return _context_from_string(config).verify(password, hashed_password)
+
+
+def _verify_and_update(
+    config: str, password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return _context_from_string(config).verify_and_update(password, hashed_password)
+
+
+class PasswordHashPool:
+    """
+    Bounded process pool for password hashing.
+
+    At most `max_workers + queue_size` jobs are admitted at a time; the rest
+    get PasswordHashPoolFull right away. Because admitted callers block on
+    their result, this also caps how many request threads auth can tie up.
+    With max_workers=0 jobs run inline in the caller (still bounded).
+    """
+
+    def __init__(self, max_workers: int, queue_size: int):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" avoids forking a process that already runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHashPoolFull()
+
+        try:
+            if self.max_workers <= 0:
+                result = fn(*args)
+            else:
+                try:
+                    future = self._get_executor().submit(fn, *args)
+                    if in_greenlet():
+                        # Async DB mode (AsyncSession.run_sync): yield to the
+                        # event loop while waiting instead of blocking it
+                        result = await_only(asyncio.wrap_future(future))
+                    else:
+                        result = future.result()
+                except BrokenProcessPool:
+                    # A worker died; start a fresh pool on the next call
+                    self.shutdown()
+                    raise PasswordHashPoolFull()
+            self.completed += 1
+            return result
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
+class PasswordPolicy:
+    """
+    The active hasher and cost. Swapped as a whole by configure().
+    """
+
+    def __init__(self, name: str, cost: int):
+        self.configure(name, cost)
+
+    def configure(self, name: str, cost: int) -> None:
+        context = build_context(name, cost)
+        self.name = name
+        self.cost = cost
+        self.context = context
+        self.config = context.to_string()
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return self.context.needs_update(hashed_password)
+
+
+password_policy = PasswordPolicy(
+    settings.PASSWORD_HASHER,
+    settings.PASSWORD_HASH_COST or HASHERS[settings.PASSWORD_HASHER].default_cost,
+)
+
+
+def configure_password_hashing() -> None:
+    """
+    Pick the cost from PASSWORD_HASH_TARGET_MS if set (run once at startup).
+    An explicit PASSWORD_HASH_COST always wins.
+    """
+    if settings.PASSWORD_HASH_COST or settings.PASSWORD_HASH_TARGET_MS <= 0:
+        return
+    cost = autotune_cost(settings.PASSWORD_HASHER, settings.PASSWORD_HASH_TARGET_MS)
+    if cost != password_policy.cost:
+        logger.info(
+            "Password hasher %s: cost %d meets %d ms target",
+            settings.PASSWORD_HASHER, cost, settings.PASSWORD_HASH_TARGET_MS,
+        )
+        password_policy.configure(settings.PASSWORD_HASHER, cost)
+
+
+def hash_password(password: str) -> str:
+    return password_hash_pool.run(_hash, password_policy.config, password)
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    return password_hash_pool.run(_verify, password_policy.config, password, hashed_password)
+
+
+def check_password_and_update(
+    password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify, and if the stored hash is stale (old scheme or cost) also
+    return a fresh hash for it; otherwise the second value is None.
+    """
+    return password_hash_pool.run(
+        _verify_and_update, password_policy.config, password, hashed_password
+    )
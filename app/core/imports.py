@@ -0,0 +1,200 @@
+"""
+Streaming parsers and progress tracking for library imports.
+
+Uploads are parsed as they arrive: bytes are decoded incrementally, split
+into lines, and turned into one dict per row, so memory use depends on
+the batch size, not the file size.
+
+Formats:
+  - csv: a header row, then one row per record. Quoted fields may span
+    lines. Goodreads and StoryGraph export headers are recognised
+    (see COLUMN_ALIASES).
+  - ndjson: one JSON object per line, with the same keys.
+
+Rows are numbered from 1 (the first record after the CSV header).
+"""
+import codecs
+import csv
+import json
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+# Export column (lowercased) -> field of BookCreate / ReadingLogCreate
+COLUMN_ALIASES = {
+    "book_id": "book_id",
+    "title": "title",
+    "author": "author",
+    "authors": "author",  # StoryGraph
+    "total_pages": "total_pages",
+    "number of pages": "total_pages",  # Goodreads
+    "pages": "total_pages",
+    "date": "date",
+    "date read": "date",  # Goodreads
+    "last date read": "date",  # StoryGraph
+    "pages_read": "pages_read",
+    "pages read": "pages_read",
+    "note": "note",
+    "my review": "note",  # Goodreads
+    "review": "note",  # StoryGraph
+}
+
+FORMATS = ("csv", "ndjson")
+
+# (row number, normalised row) or (row number, error message)
+ParsedRow = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def detect_format(content_type: str) -> str:
+    # application/x-ndjson, application/jsonl, application/json
+    if "json" in content_type.lower():
+        return "ndjson"
+    return "csv"
+
+
+def normalise_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map known columns to our field names; drop unknown ones and blanks.
+    """
+    normalised = {}
+    for key, value in row.items():
+        field = COLUMN_ALIASES.get(str(key).strip().lower())
+        if field is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        normalised.setdefault(field, value)
+    return normalised
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    quotes = 0
+    row_number = 0
+
+    async for line in lines:
+        # A record is complete once its quotes balance ("" escapes count twice)
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        text = "\n".join(record)
+        record, quotes = [], 0
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        row_number += 1
+        if len(values) > len(header):
+            yield row_number, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, normalise_row(dict(zip(header, values)))
+
+    if record:
+        yield row_number + 1, "unterminated quoted field"
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, "invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, "expected a JSON object"
+            continue
+        yield row_number, normalise_row(row)
+
+
+def iter_rows(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[ParsedRow]:
+    lines = iter_lines(chunks)
+    return iter_ndjson_rows(lines) if fmt == "ndjson" else iter_csv_rows(lines)
+
+
+class ImportJob:
+    def __init__(self, user_id: int, fmt: str, max_errors: int):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.format = fmt
+        self.status = "running"
+        self.rows = 0
+        self.books_created = 0
+        self.logs_created = 0
+        self.error_count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.max_errors = max_errors
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def add_error(self, row: int, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    def finish(self, status: str = "done") -> None:
+        self.status = status
+        self.finished_at = datetime.utcnow()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "format": self.format,
+            "status": self.status,
+            "rows": self.rows,
+            "books_created": self.books_created,
+            "logs_created": self.logs_created,
+            "error_count": self.error_count,
+            "errors": list(self.errors),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ImportJobs:
+    """
+    The most recent imports of this worker, so clients can poll progress
+    (GET /imports) while their upload is still streaming.
+    """
+
+    def __init__(self, maxlen: int = 100):
+        self._jobs: Deque[ImportJob] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def start(self, user_id: int, fmt: str, max_errors: int) -> ImportJob:
+        job = ImportJob(user_id, fmt, max_errors)
+        with self._lock:
+            self._jobs.append(job)
+        return job
+
+    def for_user(self, user_id: int) -> List[ImportJob]:
+        with self._lock:
+            return [job for job in reversed(self._jobs) if job.user_id == user_id]
+
+
+import_jobs = ImportJobs()
@@ -0,0 +1,111 @@
+"""
+Asymmetric JWT signing keys.
+
+With an RS*/ES*/PS* ALGORITHM, access tokens are signed with a private
+key and carry its `kid` in the header. Public keys are published at
+/.well-known/jwks.json so other services can verify tokens locally.
+
+Keys are read from JWT_KEYS_DIR, one PEM per key, named `<kid>.pem`.
+Private keys can sign and verify; public-only PEMs (retired keys kept
+until their tokens expire) verify only. JWT_ACTIVE_KID picks the signing
+key (default: the last private key by name).
+
+Rotation: add the new key's file while the old one stays active. Wait at
+least JWKS_CACHE_MAX_AGE_SECONDS so consumers see it, then switch
+JWT_ACTIVE_KID. Replace the old file with its public half, and remove it
+once ACCESS_TOKEN_EXPIRE_MINUTES have passed.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jose import JWTError, jwk, jwt
+
+from app.core.config import settings
+
+ASYMMETRIC_PREFIXES = ("RS", "ES", "PS")
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    return algorithm.upper().startswith(ASYMMETRIC_PREFIXES)
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_pem: str
+    private_pem: Optional[str] = None
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: str, algorithm: str) -> "SigningKey":
+        key = jwk.construct(pem, algorithm)
+        if key.is_public():
+            return cls(kid=kid, algorithm=algorithm, public_pem=pem)
+        public_pem = key.public_key().to_pem().decode("ascii")
+        return cls(kid=kid, algorithm=algorithm, public_pem=public_pem, private_pem=pem)
+
+    def to_jwk(self) -> Dict[str, str]:
+        data = jwk.construct(self.public_pem, self.algorithm).to_dict()
+        data.update({"kid": self.kid, "use": "sig", "alg": self.algorithm})
+        return data
+
+
+class KeyRing:
+    def __init__(self, keys: List[SigningKey], active_kid: Optional[str] = None):
+        self.keys = {key.kid: key for key in keys}
+        signers = [key.kid for key in keys if key.private_pem]
+        if not signers:
+            raise ValueError("No private JWT signing key found")
+
+        active_kid = active_kid or sorted(signers)[-1]
+        if active_kid not in signers:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} has no private key")
+        self.signing_key = self.keys[active_kid]
+
+    @classmethod
+    def from_directory(
+        cls, path: str, algorithm: str, active_kid: Optional[str] = None
+    ) -> "KeyRing":
+        keys = [
+            SigningKey.from_pem(pem_file.stem, pem_file.read_text(), algorithm)
+            for pem_file in sorted(Path(path).glob("*.pem"))
+        ]
+        return cls(keys, active_kid)
+
+    def encode(self, claims: dict) -> str:
+        key = self.signing_key
+        return jwt.encode(
+            claims,
+            key.private_pem,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
+
+    def decode(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key.public_pem, algorithms=[key.algorithm])
+
+    def jwks(self) -> Dict[str, list]:
+        return {"keys": [key.to_jwk() for key in self.keys.values()]}
+
+
+def load_key_ring() -> Optional[KeyRing]:
+    """
+    The configured key ring, or None when tokens use a shared secret (HS*).
+    """
+    if not is_asymmetric(settings.ALGORITHM):
+        return None
+    if not settings.JWT_KEYS_DIR:
+        raise ValueError(f"JWT_KEYS_DIR must be set for ALGORITHM={settings.ALGORITHM}")
+    return KeyRing.from_directory(
+        settings.JWT_KEYS_DIR,
+        settings.ALGORITHM,
+        settings.JWT_ACTIVE_KID or None,
+    )
+
+
+key_ring = load_key_ring()
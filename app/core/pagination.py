@@ -0,0 +1,63 @@
+"""
+Opaque keyset cursors.
+
+A cursor holds the sort key of the last row of a page, so the next page
+is a range condition on an index (`WHERE (date, id) < (:date, :id)`)
+instead of OFFSET, which makes the database read and discard every
+skipped row. Page N costs the same as page 1.
+
+List endpoints return the cursor for the next page in the X-Next-Cursor
+header (absent on the last page); the body stays a plain list.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fields: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor, converting each value with
+    `fields[name]` (e.g. {"date": date.fromisoformat, "id": int}).
+    Raises 400 for anything malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, dict) or sorted(values) != sorted(fields):
+            raise ValueError(cursor)
+        return {name: convert(values[name]) for name, convert in fields.items()}
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def check_page_params(cursor: Optional[str], skip: int) -> None:
+    if cursor is not None and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or skip, not both",
+        )
+
+
+def set_next_cursor(response: Response, rows: List[Any], limit: int, key) -> List[Any]:
+    """
+    `rows` was fetched with limit + 1: if the extra row is there, trim it
+    and point the next cursor at the last row kept.
+    """
+    if len(rows) > limit:
+        rows = rows[:max(limit, 0)]
+        if rows:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+    return rows
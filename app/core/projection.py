@@ -0,0 +1,57 @@
+"""
+Sparse fieldsets (`?fields=id,date`) for list endpoints.
+
+With `fields`, a list endpoint selects only those columns and returns
+plain JSON rows: no ORM objects are hydrated and no response model runs,
+so unrequested columns (e.g. long notes) are never read, built or sent.
+The sort-key columns are always included, since the next-page cursor is
+built from them.
+"""
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    always: Sequence[str] = ("id",),
+) -> Optional[List[str]]:
+    """
+    Requested column names, in `allowed` order, plus `always`.
+    None when no projection was asked for; 400 on unknown names.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))} "
+                   f"(available: {', '.join(allowed)})",
+        )
+    requested.update(always)
+    return [name for name in allowed if name in requested]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def projected_response(rows: List[Any], columns: List[str], response: Response) -> JSONResponse:
+    """
+    Serialize projected rows directly, keeping the headers (cursor, ETag)
+    set on the endpoint's `response`.
+    """
+    content = [{name: _encode(value) for name, value in zip(columns, row)} for row in rows]
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name != "content-length"
+    }
+    return JSONResponse(content=content, headers=headers)
@@ -0,0 +1,311 @@
+"""
+Token-bucket admission control.
+
+Runs as ASGI middleware so over-budget requests are turned away before any
+dependency runs: no DB session is opened and bcrypt is never reached.
+
+Budgets:
+  - per client IP and per target email on /auth/login and /auth/register
+  - per authenticated user (from the bearer token's `sub`) everywhere else
+
+Bucket state lives in a pluggable backend. The in-memory backend is per
+worker; the SQLite backend keeps buckets in a local file so all workers
+on a host share one budget (a stand-in for Redis or similar).
+"""
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+AUTH_PATHS = {"/auth/login", "/auth/register"}
+MAX_AUTH_BODY_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    `capacity` requests of burst, refilled evenly over `period` seconds.
+    """
+    capacity: float
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rate(value: str) -> RateLimit:
+    """
+    Parse "N/S" (N requests per S seconds), e.g. "20/60".
+    """
+    capacity, period = value.split("/", 1)
+    return RateLimit(capacity=float(capacity), period=float(period))
+
+
+# ----- Backends -----
+
+
+class InMemoryBackend:
+    """
+    Buckets in this process only. Bounded: least recently used keys are
+    dropped first (a dropped bucket simply starts full again).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_rate)
+
+            if tokens >= 1:
+                retry_after = 0.0
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / limit.refill_rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    """
+    Buckets in a local SQLite file, shared by every worker on the host.
+    Each take() is one short IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, limit: RateLimit) -> float:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (limit.capacity, now)
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_rate)
+
+            if tokens >= 1:
+                retry_after = 0.0
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / limit.refill_rate
+
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit_buckets")
+
+
+def create_backend(url: str):
+    """
+    "memory" or "sqlite:///path/to/file.db".
+    """
+    if url == "memory":
+        return InMemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported RATE_LIMIT_BACKEND: {url!r}")
+
+
+# ----- Limiter -----
+
+
+class RateLimiter:
+    def __init__(self, backend, limits: Dict[str, RateLimit], enabled: bool = True):
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+        self.allowed: Dict[str, int] = defaultdict(int)
+        self.limited: Dict[str, int] = defaultdict(int)
+
+    def hit(self, scope: str, key: str) -> float:
+        """
+        Spend one token from `scope`'s bucket for `key`.
+        Returns 0 if allowed, otherwise seconds until a token is available.
+        May block (the SQLite backend waits on its file lock); use
+        hit_async from the event loop.
+        """
+        retry_after = self.backend.take(f"{scope}:{key}", self.limits[scope])
+        if retry_after:
+            self.limited[scope] += 1
+        else:
+            self.allowed[scope] += 1
+        return retry_after
+
+    async def hit_async(self, scope: str, key: str) -> float:
+        if isinstance(self.backend, InMemoryBackend):
+            # Never blocks for more than a dict update
+            return self.hit(scope, key)
+        return await run_in_threadpool(self.hit, scope, key)
+
+    def reset(self) -> None:
+        self.backend.reset()
+        self.allowed.clear()
+        self.limited.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "enabled": self.enabled,
+            "allowed": dict(self.allowed),
+            "limited": dict(self.limited),
+        }
+
+
+rate_limiter = RateLimiter(
+    backend=create_backend(settings.RATE_LIMIT_BACKEND),
+    limits={
+        "auth_ip": parse_rate(settings.RATE_LIMIT_AUTH_PER_IP),
+        "auth_email": parse_rate(settings.RATE_LIMIT_AUTH_PER_EMAIL),
+        "user": parse_rate(settings.RATE_LIMIT_PER_USER),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
+
+
+# ----- Middleware -----
+
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+def _user_from_headers(scope: Scope) -> Optional[str]:
+    # Imported lazily: security pulls in the DB layer
+    from app.core.security import decode_access_token
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                subject = decode_access_token(token).get("sub")
+            except JWTError:
+                return None
+            return str(subject) if subject is not None else None
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] in AUTH_PATHS:
+            client = scope.get("client")
+            retry_after = await self.limiter.hit_async(
+                "auth_ip", client[0] if client else "unknown"
+            )
+            if retry_after:
+                await self._reject(retry_after, scope, receive, send)
+                return
+
+            body, receive = await _buffer_body(receive)
+            email = _email_from_body(body) if body is not None else None
+            if email:
+                retry_after = await self.limiter.hit_async("auth_email", email)
+                if retry_after:
+                    await self._reject(retry_after, scope, receive, send)
+                    return
+        else:
+            user = _user_from_headers(scope)
+            if user is not None:
+                retry_after = await self.limiter.hit_async("user", user)
+                if retry_after:
+                    await self._reject(retry_after, scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(retry_after: float, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=429,
+            content={"error": "Too many requests"},
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+        await response(scope, receive, send)
+
+
+async def _buffer_body(receive: Receive) -> Tuple[Optional[bytes], Receive]:
+    """
+    Read the request body so it can be inspected, and return a `receive`
+    that replays it to the app. Reading stops once the body exceeds
+    MAX_AUTH_BODY_BYTES: it is not inspected (None), and the app gets the
+    chunks read so far followed by the rest straight from `receive`.
+    """
+    messages = []
+    size = 0
+    more_body = True
+    while more_body and size <= MAX_AUTH_BODY_BYTES:
+        message = await receive()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        more_body = message.get("more_body", False) and message["type"] == "http.request"
+
+    async def replay() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    if size > MAX_AUTH_BODY_BYTES:
+        return None, replay
+    return b"".join(m.get("body", b"") for m in messages), replay
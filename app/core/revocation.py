@@ -0,0 +1,164 @@
+"""
+Access-token revocation.
+
+Revoked `jti`s are stored in revoked_access_tokens. Each worker mirrors
+them into a Bloom filter, refreshed incrementally from the table, so the
+common case (token not revoked) costs a few hash probes and no query.
+Only a filter hit is confirmed against the database.
+
+Incremental syncs follow revoked_at rather than ids: ids come from a
+sequence and can commit out of order, so an id watermark could skip a
+row for good. Each sync re-reads SYNC_OVERLAP before the newest
+revoked_at seen; re-adding a jti to the filter is harmless.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# How far behind the newest revoked_at each sync looks again, to catch
+# rows whose transaction started earlier but committed later
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """
+    Per-worker view of revoked_access_tokens.
+
+    sync() pulls rows revoked since the newest one seen (minus
+    SYNC_OVERLAP). Every REVOCATION_REBUILD_SECONDS the filter is rebuilt
+    from unexpired rows only, which drops expired entries and resizes it
+    if it has grown.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        self._last_seen: Optional[datetime] = None
+        self._last_rebuild = 0.0
+        self._lock = threading.Lock()
+
+        self.filter_hits = 0
+        self.false_positives = 0
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self._filter.add(jti)
+
+    def might_contain(self, jti: str) -> bool:
+        return jti in self._filter
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        if jti not in self._filter:
+            return False
+
+        self.filter_hits += 1
+        revoked = db.execute(
+            select(models.RevokedAccessToken.id).where(
+                models.RevokedAccessToken.jti == jti
+            )
+        ).first() is not None
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def sync(self, db: Session) -> None:
+        if time.monotonic() - self._last_rebuild >= settings.REVOCATION_REBUILD_SECONDS:
+            self.rebuild(db)
+            return
+
+        query = select(models.RevokedAccessToken.jti, models.RevokedAccessToken.revoked_at)
+        if self._last_seen is not None:
+            query = query.where(
+                models.RevokedAccessToken.revoked_at >= self._last_seen - SYNC_OVERLAP
+            )
+        rows = db.execute(query).all()
+        with self._lock:
+            for row in rows:
+                # The overlap re-reads rows; don't count them twice
+                if row.jti not in self._filter:
+                    self._filter.add(row.jti)
+            self._advance(rows)
+
+        if self._filter.count > self._filter.capacity:
+            self.rebuild(db)
+
+    def rebuild(self, db: Session) -> None:
+        rows = db.execute(
+            select(models.RevokedAccessToken.jti, models.RevokedAccessToken.revoked_at)
+            .where(models.RevokedAccessToken.expires_at > datetime.utcnow())
+        ).all()
+
+        capacity = max(settings.REVOCATION_FILTER_CAPACITY, len(rows) * 2)
+        fresh = BloomFilter(capacity, self.error_rate)
+        for row in rows:
+            fresh.add(row.jti)
+
+        with self._lock:
+            # Anything revoked after our SELECT is picked up by the next sync
+            self._filter = fresh
+            self._advance(rows)
+            self._last_rebuild = time.monotonic()
+
+    def _advance(self, rows) -> None:
+        newest = max((row.revoked_at for row in rows), default=None)
+        if newest is not None and (self._last_seen is None or newest > self._last_seen):
+            self._last_seen = newest
+
+    def sync_with(self, session_factory: Callable[[], Session]) -> None:
+        db = session_factory()
+        try:
+            self.sync(db)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": self._filter.count,
+            "capacity": self._filter.capacity,
+            "bits": self._filter.num_bits,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+        }
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+)
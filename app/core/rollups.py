@@ -0,0 +1,108 @@
+"""
+Daily reading rollups.
+
+reading_daily_rollups holds one row per user, book and day with the pages
+read and the number of logs (sessions) behind them. Every write to
+reading_logs records its effect in a RollupDeltas and applies it in the
+same transaction, so aggregates can read the rollup and cost scales with
+days read rather than log entries. `python -m app.cli rebuild-rollups`
+reconciles any drift (e.g. rows changed with raw SQL).
+
+Writers call bump_data_version before reading the logs they change: its
+row lock serialises each user's writers, so deltas are computed from
+current values and every transaction takes its locks in the same order.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import and_, bindparam, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+
+# (user_id, book_id, date)
+RollupKey = Tuple[int, int, date]
+
+
+class RollupDeltas:
+    """
+    Net change to the rollup from one transaction's log writes. Changes to
+    the same day cancel out, so moving a log within a day is one update.
+    """
+
+    def __init__(self):
+        self._deltas: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, user_id: int, book_id: int, day: date, pages: int) -> None:
+        self.adjust(user_id, book_id, day, pages, 1)
+
+    def remove(self, user_id: int, book_id: int, day: date, pages: int) -> None:
+        self.adjust(user_id, book_id, day, -pages, -1)
+
+    def adjust(self, user_id: int, book_id: int, day: date, pages: int, sessions: int) -> None:
+        delta = self._deltas[(user_id, book_id, day)]
+        delta[0] += pages
+        delta[1] += sessions
+
+    def __len__(self) -> int:
+        return sum(1 for pages, sessions in self._deltas.values() if pages or sessions)
+
+    def apply(self, db: Session) -> None:
+        """
+        One multi-row upsert for every changed day, then drop the days
+        whose last log went away.
+        """
+        changes = [
+            {"user_id": user_id, "book_id": book_id, "date": day, "pages": pages, "sessions": sessions}
+            for (user_id, book_id, day), (pages, sessions) in self._deltas.items()
+            if pages or sessions
+        ]
+        self._deltas.clear()
+        if not changes:
+            return
+
+        table = models.ReadingDailyRollup.__table__
+        insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.book_id, table.c.date],
+                set_={
+                    "pages": table.c.pages + stmt.excluded.pages,
+                    "sessions": table.c.sessions + stmt.excluded.sessions,
+                },
+            ),
+            changes,
+        )
+
+        shrunk = [change for change in changes if change["sessions"] < 0 or change["pages"] < 0]
+        if shrunk:
+            db.execute(
+                delete(table).where(
+                    and_(
+                        table.c.user_id == bindparam("b_user_id"),
+                        table.c.book_id == bindparam("b_book_id"),
+                        table.c.date == bindparam("b_date"),
+                        table.c.sessions <= 0,
+                    )
+                ),
+                [
+                    {"b_user_id": c["user_id"], "b_book_id": c["book_id"], "b_date": c["date"]}
+                    for c in shrunk
+                ],
+            )
+
+
+def delete_book_rollups(db: Session, user_id: int, book_ids: Iterable[int]) -> None:
+    """
+    For set-based book deletes, which remove the logs without going through
+    RollupDeltas (ON DELETE CASCADE covers this on Postgres, not on SQLite).
+    """
+    db.execute(
+        delete(models.ReadingDailyRollup).where(
+            models.ReadingDailyRollup.user_id == user_id,
+            models.ReadingDailyRollup.book_id.in_(list(book_ids)),
+        )
+    )
@@ -1,24 +1,34 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core import keys
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.hashing import (
+    PasswordHashPoolFull,
+    check_password,
+    check_password_and_update,
+    hash_password,
+)
+from app.db.session import get_async_db, get_db
 from app import models
+from app.core.revocation import revocation_list
 import hashlib
 import secrets
-
-# ----- Password hashing context (bcrypt) -----
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import uuid
 
 # Bearer token extraction from Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# Same, but the header is optional (e.g. logout)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 MAX_BCRYPT_BYTES = 72
 
@@ -46,14 +56,42 @@ def _truncate_for_bcrypt(password: str) -> str:
 # ----- Password helpers -----
 
 
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     plain_password = _truncate_for_bcrypt(plain_password)
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return check_password(plain_password, hashed_password)
+    except PasswordHashPoolFull:
+        raise _hashing_busy_exception()
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Like verify_password, but also returns a replacement hash when the
+    stored one uses an outdated scheme or cost (None otherwise).
+    """
+    plain_password = _truncate_for_bcrypt(plain_password)
+    try:
+        return check_password_and_update(plain_password, hashed_password)
+    except PasswordHashPoolFull:
+        raise _hashing_busy_exception()
 
 
 def get_password_hash(password: str) -> str:
     password = _truncate_for_bcrypt(password)
-    return pwd_context.hash(password)
+    try:
+        return hash_password(password)
+    except PasswordHashPoolFull:
+        raise _hashing_busy_exception()
 
 
 # ----- JWT helpers -----
@@ -73,6 +111,11 @@ def create_access_token(
         )
 
     to_encode.update({"exp": expire})
+    # Unique id so this token can be revoked before it expires
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    if keys.key_ring is not None:
+        return keys.key_ring.encode(to_encode)
+
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -82,17 +125,63 @@ def create_access_token(
 
 
 def decode_access_token(token: str) -> dict:
+    if keys.key_ring is not None:
+        return keys.key_ring.decode(token)
     payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     return payload
 
 
+# ----- Authenticated principal cache -----
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Lightweight stand-in for the authenticated user.
+    Carries only what the routers need, so it can be cached.
+    """
+    id: int
+    email: str
+    created_at: datetime
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_cached_principal(mapper, connection, target) -> None:
+    principal_cache.invalidate(target.id)
+
+
+def _load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = (
+        db.query(models.User.id, models.User.email, models.User.created_at)
+        .filter(models.User.id == user_id, models.User.disabled_at.is_(None))
+        .first()
+    )
+    if row is None:
+        return None
+
+    principal = Principal(id=row.id, email=row.email, created_at=row.created_at)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
 # ----- Current user dependency -----
 
 
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> models.User:
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -108,18 +197,99 @@ def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None:
+    jti = payload.get("jti")
+    if jti and revocation_list.is_revoked(db, jti):
+        raise credentials_exception
+    # Account-wide revocation (see revoke_user_tokens)
+    if revocation_list.is_revoked(db, _user_revocation_key(user_id)):
         raise credentials_exception
 
-    return user
+    principal = _load_principal(db, user_id)
+    if principal is None:
+        raise credentials_exception
+
+    # Lets the session know whose data it writes (read-your-writes routing)
+    db.info["user_id"] = principal.id
+
+    return principal
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    """
+    get_current_user for async mode. Runs the same code on the async
+    session's greenlet; a cache hit performs no I/O at all.
+    """
+    return await db.run_sync(lambda session: get_current_user(db=session, token=token))
+
+
+def revoke_access_token(db: Session, token: str) -> None:
+    """
+    Record the token's jti as revoked (caller commits).
+    Invalid or already-expired tokens are ignored.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return
+
+    jti, exp = payload.get("jti"), payload.get("exp")
+    if not jti or not exp:
+        return
+
+    _record_revocation(db, jti, datetime.utcfromtimestamp(exp))
+
+
+def _user_revocation_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> None:
+    """
+    Revoke every token the user holds (caller commits): their live refresh
+    tokens, and all access tokens at once through a `user:<id>` entry in
+    the revocation list that get_current_user checks alongside the jti.
+    The entry lasts as long as any access token issued until now.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.user_id == user_id,
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    _record_revocation(
+        db,
+        _user_revocation_key(user_id),
+        now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    principal_cache.invalidate(user_id)
+
+
+def _record_revocation(db: Session, jti: str, expires_at: datetime) -> None:
+    exists = (
+        db.query(models.RevokedAccessToken.id)
+        .filter(models.RevokedAccessToken.jti == jti)
+        .first()
+    )
+    if exists is None:
+        db.add(models.RevokedAccessToken(jti=jti, expires_at=expires_at))
+    # Effective in this worker right away; others pick it up on their next sync
+    revocation_list.add(jti)
+
 
-def hash_refresh_token(token: str) -> str:
+def hash_refresh_token(token: str) -> bytes:
     """
     Hash refresh token with a server-side pepper (SECRET_KEY).
+    Returns the raw 32-byte digest (stored as-is, not hex-encoded).
     """
     data = (token + settings.SECRET_KEY).encode("utf-8")
-    return hashlib.sha256(data).hexdigest()
+    return hashlib.sha256(data).digest()
 
 
 def create_refresh_token() -> str:
@@ -0,0 +1,101 @@
+"""
+Async versions of the sync routers.
+
+Each sync endpoint is wrapped in an `async def` that runs the original
+body through AsyncSession.run_sync. That keeps one implementation of
+every route. The ORM code runs on SQLAlchemy's greenlet over an asyncio
+driver, so it never touches the anyio threadpool: a worker is limited by
+its connection pool, not by ~40 threads.
+
+Endpoints that are already `async def` are reused as they are. Endpoints
+without a DB dependency keep their sync form (nothing to gain).
+"""
+import inspect
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_user, get_current_user_async
+from app.db.routing import get_async_read_db, get_read_db
+from app.db.session import get_async_db, get_db
+
+# Sync dependency -> async replacement
+ASYNC_DEPENDENCIES: Dict[Callable, Callable] = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_current_user: get_current_user_async,
+}
+
+SYNC_SESSION_DEPENDENCIES = {get_db, get_read_db}
+
+
+def _session_param(signature: inspect.Signature) -> Optional[str]:
+    for param in signature.parameters.values():
+        default = param.default
+        if isinstance(default, DependsParam) and default.dependency in SYNC_SESSION_DEPENDENCIES:
+            return param.name
+    return None
+
+
+def asyncify_endpoint(endpoint: Callable) -> Callable:
+    signature = inspect.signature(endpoint)
+    db_param = _session_param(signature)
+    if db_param is None:
+        return endpoint
+
+    params = []
+    for param in signature.parameters.values():
+        default = param.default
+        if isinstance(default, DependsParam) and default.dependency in ASYNC_DEPENDENCIES:
+            annotation = AsyncSession if param.name == db_param else param.annotation
+            param = param.replace(
+                default=Depends(ASYNC_DEPENDENCIES[default.dependency]),
+                annotation=annotation,
+            )
+        params.append(param)
+
+    async def async_endpoint(**kwargs: Any) -> Any:
+        db: AsyncSession = kwargs.pop(db_param)
+        return await db.run_sync(lambda session: endpoint(**{db_param: session}, **kwargs))
+
+    async_endpoint.__signature__ = signature.replace(parameters=params)
+    async_endpoint.__name__ = endpoint.__name__
+    async_endpoint.__doc__ = endpoint.__doc__
+    return async_endpoint
+
+
+def mirror_router(router: APIRouter) -> APIRouter:
+    """
+    Build an APIRouter with the same routes as `router`, served async.
+    """
+    mirrored = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            mirrored.routes.append(route)
+            continue
+
+        endpoint = route.endpoint
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = asyncify_endpoint(endpoint)
+
+        mirrored.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            responses=route.responses,
+            name=route.name,
+            response_class=route.response_class,
+            response_model_exclude_unset=route.response_model_exclude_unset,
+            response_model_exclude_none=route.response_model_exclude_none,
+            include_in_schema=route.include_in_schema,
+        )
+    return mirrored
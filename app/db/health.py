@@ -0,0 +1,96 @@
+"""
+Cached database health for the readiness probe.
+
+Probes used to run SELECT 1 per request, so probe traffic scaled with the
+number of load balancers and orchestrator nodes, and piled onto the pool
+during a database blip. Now one prober per worker checks the primary
+every HEALTH_PROBE_INTERVAL_SECONDS (background task) and requests only
+read the cached result.
+
+If the cache is older than the interval (background task not running),
+one request refreshes it inline while concurrent requests get the stale
+copy, so there is still at most one probe in flight.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.routing import replica_router
+from app.db.session import engine, pool_stats
+
+
+def _saturation(pool: Dict[str, Any]) -> Optional[float]:
+    """
+    Share of the pool's maximum connections that are checked out.
+    """
+    if "size" not in pool:
+        return None
+    capacity = pool["size"] + max(pool["max_overflow"], 0)
+    return round(pool["checked_out"] / capacity, 3) if capacity else None
+
+
+class HealthProber:
+    def __init__(self, engine: Engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+
+    def probe(self) -> Dict[str, Any]:
+        """
+        Check the primary now and cache the result.
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as e:
+            error = type(e).__name__
+
+        pools = pool_stats()
+        state = {
+            "database": "ok" if error is None else "down",
+            "database_error": error,
+            "probe_ms": round((time.perf_counter() - started) * 1000, 3),
+            "pools": {
+                name: {**pool, "saturation": _saturation(pool)}
+                for name, pool in pools.items()
+            },
+            "read_replicas": [
+                {"name": replica.name, "healthy": replica.healthy, "failures": replica.failures}
+                for replica in replica_router.replicas
+            ],
+        }
+        self._state = state
+        self._checked_at = time.monotonic()
+        return state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The cached state with its age, refreshed inline only when expired
+        and no other request is already refreshing it.
+        """
+        if self._state is None or self.age() >= self.interval:
+            if self._lock.acquire(blocking=self._state is None):
+                try:
+                    if self._state is None or self.age() >= self.interval:
+                        self.probe()
+                finally:
+                    self._lock.release()
+        return {**self._state, "age_seconds": round(self.age(), 3)}
+
+    def age(self) -> float:
+        return time.monotonic() - self._checked_at
+
+    def refresh(self) -> None:
+        with self._lock:
+            self.probe()
+
+
+health_prober = HealthProber(engine, settings.HEALTH_PROBE_INTERVAL_SECONDS)
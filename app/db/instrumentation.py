@@ -0,0 +1,197 @@
+"""
+Per-request SQL instrumentation.
+
+QueryStatsMiddleware gives every HTTP request a QueryStats (held in a
+contextvar, so it follows the request into the threadpool and into
+SQLAlchemy's async greenlets). Cursor events on each instrumented engine
+add the statements the request runs to it.
+
+For every request:
+  - statements slower than SLOW_QUERY_MS are logged with the route and
+    their parameters;
+  - a statement executed N_PLUS_ONE_THRESHOLD times or more is logged as
+    a likely N+1;
+  - per-route totals are kept for GET /metrics.
+
+Listeners registered with add_listener() receive each finished request's
+QueryStats; the test suite uses this to enforce per-endpoint budgets.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    def __init__(self, route: str = ""):
+        self.route = route
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """
+        Statements executed at least `threshold` times (likely N+1).
+        """
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(route: str = "") -> Iterator[QueryStats]:
+    """
+    Collect the statements run in this context (and the threads/greenlets
+    it spawns) into a fresh QueryStats.
+    """
+    stats = QueryStats(route)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if settings.SLOW_QUERY_MS > 0 and elapsed_ms >= settings.SLOW_QUERY_MS:
+        # Never the parameter values: they include password hashes, token
+        # digests, emails and private notes
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s; %s",
+            elapsed_ms,
+            stats.route if stats is not None else "<no request>",
+            statement,
+            _describe_parameters(parameters, executemany),
+        )
+
+
+def _describe_parameters(parameters, executemany: bool) -> str:
+    if executemany:
+        return f"executemany, {len(parameters)} rows"
+    return f"{len(parameters or ())} parameters"
+
+
+def instrument_queries(engine: Engine) -> None:
+    """
+    Attach the statement timing events to a (sync) engine. Idempotent.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteTotals:
+    """
+    Per-route statement counts across requests, for GET /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, stats: QueryStats) -> None:
+        with self._lock:
+            totals = self._routes.setdefault(
+                stats.route,
+                {"requests": 0, "queries": 0, "max_queries": 0, "query_ms": 0.0, "n_plus_one": 0},
+            )
+            totals["requests"] += 1
+            totals["queries"] += stats.count
+            totals["max_queries"] = max(totals["max_queries"], stats.count)
+            totals["query_ms"] += stats.total_ms
+            if stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                totals["n_plus_one"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {**totals, "query_ms": round(totals["query_ms"], 3)}
+                for route, totals in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_totals = RouteTotals()
+
+_listeners: List[Callable[[QueryStats], None]] = []
+
+
+def add_listener(listener: Callable[[QueryStats], None]) -> None:
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[QueryStats], None]) -> None:
+    _listeners.remove(listener)
+
+
+def _route_name(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope["path"]
+    return f"{scope['method']} {path}"
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # Routing has run by now and left the matched route in scope
+                stats.route = _route_name(scope)
+                self._finish(stats)
+
+    @staticmethod
+    def _finish(stats: QueryStats) -> None:
+        for statement, times in stats.repeated(settings.N_PLUS_ONE_THRESHOLD).items():
+            logger.warning(
+                "Possible N+1 on %s: statement ran %d times: %s",
+                stats.route,
+                times,
+                statement,
+            )
+        route_totals.add(stats)
+        for listener in list(_listeners):
+            listener(stats)
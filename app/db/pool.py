@@ -0,0 +1,174 @@
+"""
+Connection pool configuration and telemetry.
+
+Engines built with engine_options() use an instrumented QueuePool that
+times every checkout (including waits for a free connection) and tracks
+the age of live connections. stats() is served under /metrics and by
+the readiness probe.
+"""
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.wait_counts: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_total = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self._connected_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_total += seconds
+            self.checkouts += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def connection_opened(self, key: int) -> None:
+        with self._lock:
+            self._connected_at[key] = time.monotonic()
+
+    def connection_closed(self, key: int) -> None:
+        with self._lock:
+            self._connected_at.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - t for t in self._connected_at.values()]
+            # Cumulative, like Prometheus "le" buckets
+            histogram = {}
+            running = 0
+            for bound, count in zip(WAIT_BUCKETS + ("inf",), self.wait_counts):
+                running += count
+                histogram[f"le_{bound}"] = running
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_total, 6),
+                "wait_histogram": histogram,
+                "connection_age_seconds": {
+                    "count": len(ages),
+                    "max": round(max(ages), 3) if ages else 0.0,
+                    "avg": round(sum(ages) / len(ages), 3) if ages else 0.0,
+                },
+            }
+
+
+class _InstrumentedPoolMixin:
+    pool_stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.pool_stats.observe_timeout()
+            raise
+        finally:
+            self.pool_stats.observe_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() swaps the pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.pool_stats = self.pool_stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _track_connection_age(pool, stats: PoolStats) -> None:
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.connection_opened(id(connection_record))
+
+    @event.listens_for(pool, "close")
+    def on_close(dbapi_connection, connection_record):
+        stats.connection_closed(id(connection_record))
+
+    # A detached connection leaves the pool; its record may reconnect later
+    @event.listens_for(pool, "detach")
+    def on_detach(dbapi_connection, connection_record):
+        stats.connection_closed(id(connection_record))
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attach PoolStats to an engine built with an instrumented pool.
+    Pass `engine.sync_engine` for async engines.
+    """
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin) and not hasattr(pool, "pool_stats"):
+        pool.pool_stats = PoolStats()
+        _track_connection_age(pool, pool.pool_stats)
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine / create_async_engine from Settings.
+    SQLite keeps SQLAlchemy's own pool choice (sizes don't apply to it).
+    """
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if parsed.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    if settings.DB_PGBOUNCER:
+        # Transaction-pooling PgBouncer can't keep per-connection prepared
+        # statements. psycopg2 never prepares server-side; these drivers do.
+        driver = parsed.get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        elif driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+
+    return options
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    pool = engine.pool
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    stats = getattr(pool, "pool_stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,215 @@
+"""
+Read-replica routing.
+
+Read-only routes depend on get_read_db instead of get_db. It hands out a
+session on one of DATABASE_REPLICA_URLS (round robin), skipping replicas
+that recently failed to connect and falling back to the primary when none
+is usable.
+
+Read-your-writes: when a session bound to a user commits a write, that
+user is pinned to the primary for REPLICA_STICKY_SECONDS, so they never
+read data older than their own last write. The pin lives in this
+worker's memory. Other workers fall back on replication lag staying
+under that window.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
+
+from fastapi import Depends
+from jose import JWTError
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token, optional_oauth2_scheme
+from app.db.instrumentation import instrument_queries
+from app.db.pool import engine_options, instrument_engine, pool_status
+from app.db.session import async_database_url, get_async_db, get_db
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, index: int, url: str):
+        # Served by /metrics and the health probe, which anyone can read:
+        # the position in DATABASE_REPLICA_URLS, never the URL
+        self.name = f"replica-{index}"
+        self.engine = create_engine(url, future=True, **engine_options(url))
+        instrument_engine(self.engine)
+        instrument_queries(self.engine)
+        self.SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine, future=True
+        )
+
+        self.async_engine = None
+        if settings.DB_ASYNC:
+            async_url = async_database_url(url)
+            self.async_engine = create_async_engine(
+                async_url, **engine_options(async_url, is_async=True)
+            )
+            instrument_engine(self.async_engine.sync_engine)
+            instrument_queries(self.async_engine.sync_engine)
+            self.AsyncSessionLocal = async_sessionmaker(
+                bind=self.async_engine, autoflush=False, expire_on_commit=False
+            )
+
+        self.down_until = 0.0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+    def mark_down(self) -> None:
+        self.failures += 1
+        self.down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "pool": pool_status(self.engine),
+        }
+
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls)]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def candidates(self) -> List[Replica]:
+        """
+        Healthy replicas in round-robin order, starting at the next one.
+        """
+        if not self.replicas:
+            return []
+        with self._lock:
+            start = next(self._counter) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.healthy]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "replicas": [replica.status() for replica in self.replicas],
+        }
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+# user id -> pinned to the primary until the entry expires
+recent_writers = TTLCache(maxsize=100_000, ttl=settings.REPLICA_STICKY_SECONDS)
+
+
+# ----- Write tracking -----
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session) -> None:
+    if session.info.pop("wrote", False):
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            recent_writers.set(user_id, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session) -> None:
+    session.info.pop("wrote", None)
+
+
+# ----- Dependencies -----
+
+
+def _sticky_user(token: Optional[str]) -> bool:
+    if not token:
+        return False
+    try:
+        subject = decode_access_token(token).get("sub")
+        return subject is not None and recent_writers.get(int(subject)) is not None
+    except (JWTError, ValueError):
+        return False
+
+
+def get_read_db(
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> Generator:
+    """
+    Session for read-only routes: a healthy replica unless the caller
+    wrote recently (or no replica is configured/usable), else `db`.
+    """
+    router = replica_router
+    if router.replicas and not _sticky_user(token):
+        for replica in router.candidates():
+            session = replica.SessionLocal()
+            try:
+                # Check out now so a dead replica fails over here, not mid-route
+                session.connection()
+            except DBAPIError:
+                logger.warning("Read replica %s unavailable", replica.name)
+                session.close()
+                replica.mark_down()
+                continue
+
+            router.replica_reads += 1
+            try:
+                yield session
+            finally:
+                session.close()
+            return
+
+    router.primary_reads += 1
+    yield db
+
+
+async def get_async_read_db(
+    db: AsyncSession = Depends(get_async_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    get_read_db for async mode.
+    """
+    router = replica_router
+    if router.replicas and not _sticky_user(token):
+        for replica in router.candidates():
+            session = replica.AsyncSessionLocal()
+            try:
+                await session.connection()
+            except DBAPIError:
+                logger.warning("Read replica %s unavailable", replica.name)
+                await session.close()
+                replica.mark_down()
+                continue
+
+            router.replica_reads += 1
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    router.primary_reads += 1
+    yield db
@@ -0,0 +1,130 @@
+"""
+Full-text search index definitions.
+
+Postgres: GIN indexes over tsvector expressions (books: title + author,
+reading_logs: note), plus a pg_trgm GIN index on books.title for fuzzy
+title matches. Queries must use exactly BOOK_DOCUMENT / LOG_DOCUMENT for
+the planner to pick the expression indexes.
+
+SQLite: one FTS5 table, search_index, kept in sync by triggers. Its rowid
+encodes the source row (books: id * 2, reading_logs: id * 2 + 1) so the
+triggers update it by rowid, and the `owner` column holds "u<user_id>" so
+per-user scoping is part of the MATCH rather than a filter afterwards.
+"""
+import html
+import re
+from typing import List, Optional
+
+SEARCH_CONFIG = "simple"
+
+# Placeholders (Unicode private use) the database wraps matches in;
+# highlighted() escapes the text and only then turns them into <mark>
+MARK_START = "\ue000"
+MARK_STOP = "\ue001"
+
+BOOK_DOCUMENT = (
+    f"to_tsvector('{SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(author, ''))"
+)
+LOG_DOCUMENT = f"to_tsvector('{SEARCH_CONFIG}', coalesce(note, ''))"
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        owner, title, author, note,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_search_insert AFTER INSERT ON books BEGIN
+        INSERT INTO search_index (rowid, owner, title, author)
+        VALUES (new.id * 2, 'u' || new.user_id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_search_update AFTER UPDATE ON books BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+        INSERT INTO search_index (rowid, owner, title, author)
+        VALUES (new.id * 2, 'u' || new.user_id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_search_delete AFTER DELETE ON books BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_insert AFTER INSERT ON reading_logs BEGIN
+        INSERT INTO search_index (rowid, owner, note)
+        VALUES (new.id * 2 + 1, 'u' || new.user_id, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_update AFTER UPDATE ON reading_logs BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        INSERT INTO search_index (rowid, owner, note)
+        VALUES (new.id * 2 + 1, 'u' || new.user_id, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS reading_logs_search_delete AFTER DELETE ON reading_logs BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+SQLITE_BACKFILL = [
+    """
+    INSERT INTO search_index (rowid, owner, title, author)
+    SELECT id * 2, 'u' || user_id, title, author FROM books
+    """,
+    """
+    INSERT INTO search_index (rowid, owner, note)
+    SELECT id * 2 + 1, 'u' || user_id, note FROM reading_logs
+    """,
+]
+
+# Triggers go with their tables; the FTS table has to be dropped by hand
+SQLITE_DROP = [
+    "DROP TABLE IF EXISTS search_index",
+]
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    The words of a user query, lowercased; punctuation and operators are
+    dropped so nothing the user types is interpreted as query syntax.
+    """
+    return [term.lower() for term in _TERM.findall(query)]
+
+
+def fts5_match(user_id: int, terms: List[str]) -> str:
+    """
+    FTS5 MATCH expression: the user's rows, with every term as a prefix
+    in any of the text columns.
+    """
+    words = " AND ".join(f'"{term}"*' for term in terms)
+    return f'owner:"u{user_id}" AND {{title author note}}: ({words})'
+
+
+def tsquery(terms: List[str]) -> str:
+    """
+    to_tsquery() input: every term, as a prefix.
+    """
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def highlighted(fragment: Optional[str]) -> Optional[str]:
+    """
+    HTML for a highlight()/snippet()/ts_headline() result: the source text
+    escaped, with the matches wrapped in <mark>.
+    """
+    if fragment is None:
+        return None
+    return (
+        html.escape(fragment, quote=False)
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_STOP, "</mark>")
+    )
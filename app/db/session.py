@@ -1,15 +1,22 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_queries
+from app.db.pool import engine_options, instrument_engine, pool_status
 
 # SQLAlchemy 2.0 style engine
 engine = create_engine(
     settings.DATABASE_URL,
     future=True,
     echo=False,  # change to True if you want to see generated SQL in logs
+    **engine_options(settings.DATABASE_URL),
 )
+instrument_engine(engine)
+instrument_queries(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -26,3 +33,68 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# ----- Async mode (DB_ASYNC=true) -----
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Swap the sync driver for its asyncio counterpart
+    (psycopg2 -> asyncpg, pysqlite -> aiosqlite).
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_DATABASE_URL = (
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    if settings.DB_ASYNC
+    else ""
+)
+
+async_engine = (
+    create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        **engine_options(ASYNC_DATABASE_URL, is_async=True),
+    )
+    if settings.DB_ASYNC
+    else None
+)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+    instrument_queries(async_engine.sync_engine)
+
+# expire_on_commit=False: responses are serialized outside the session's
+# greenlet, where expired attributes could not be lazily reloaded
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    Pool status and telemetry for every engine of this worker.
+    """
+    pools = {"primary": pool_status(engine)}
+    if async_engine is not None:
+        pools["primary_async"] = pool_status(async_engine.sync_engine)
+    return pools
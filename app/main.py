@@ -4,15 +4,37 @@ from app.core.config import settings
 from fastapi import FastAPI, Request
 from sqlalchemy import text
 
-from app.db.session import engine
+from app.db.session import engine, SessionLocal
+from app.core.hashing import configure_password_hashing, password_hash_pool
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.instrumentation import QueryStatsMiddleware
+from app.tasks.runner import PeriodicTask
+from app.tasks.accounts import purge_deleted_accounts
+from app.tasks.tokens import purge_expired_tokens
+from app.tasks.partitions import maintain_reading_log_partitions
+from app.core.revocation import revocation_list
 from app.routers.auth import router as auth_router
 from app.routers.books import router as books_router
 from app.routers.reading_logs import router as reading_logs_router
+from app.routers.search import router as search_router
+from app.routers.imports import router as imports_router
+from app.routers.metrics import router as metrics_router
+from app.routers.jwks import router as jwks_router
+from app.routers.health import router as health_router
+from app.db.health import health_prober
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException as FastAPIHTTPException
 
 app = FastAPI()
 
+# Per-request statement counts, slow-query and N+1 logging
+app.add_middleware(QueryStatsMiddleware)
+
+# Admission control runs before routing, so limited requests never reach
+# a DB session or bcrypt. Added first so CORS still wraps its 429s.
+app.add_middleware(RateLimitMiddleware)
+
 # CORS (only enabled if origins are provided)
 if settings.CORS_ORIGINS:
     app.add_middleware(
@@ -21,13 +43,70 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
+
+
+# Background maintenance (each worker runs its own; all are idempotent)
+background_tasks = [
+    PeriodicTask(
+        "health-probe",
+        settings.HEALTH_PROBE_INTERVAL_SECONDS,
+        health_prober.refresh,
+    ),
+    PeriodicTask(
+        "revocation-sync",
+        settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+        lambda: revocation_list.sync_with(SessionLocal),
+    ),
+]
+if settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS > 0:
+    background_tasks.append(
+        PeriodicTask(
+            "token-purge",
+            settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+            lambda: purge_expired_tokens(SessionLocal),
+        )
+    )
+if settings.ACCOUNT_PURGE_INTERVAL_SECONDS > 0:
+    background_tasks.append(
+        PeriodicTask(
+            "account-purge",
+            settings.ACCOUNT_PURGE_INTERVAL_SECONDS,
+            lambda: purge_deleted_accounts(SessionLocal),
+        )
     )
+if (
+    engine.dialect.name == "postgresql"
+    and settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS > 0
+):
+    background_tasks.append(
+        PeriodicTask(
+            "partition-maintenance",
+            settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            lambda: maintain_reading_log_partitions(engine),
+        )
+    )
+
 
+# Include routers (async mode serves the same routes on the event loop)
+if settings.DB_ASYNC:
+    from app.db.async_bridge import mirror_router
 
-# Include routers
-app.include_router(auth_router)
-app.include_router(books_router)
-app.include_router(reading_logs_router)
+    app.include_router(mirror_router(auth_router))
+    app.include_router(mirror_router(books_router))
+    app.include_router(mirror_router(reading_logs_router))
+    app.include_router(mirror_router(search_router))
+    app.include_router(mirror_router(imports_router))
+else:
+    app.include_router(auth_router)
+    app.include_router(books_router)
+    app.include_router(reading_logs_router)
+    app.include_router(search_router)
+    app.include_router(imports_router)
+app.include_router(metrics_router)
+app.include_router(jwks_router)
+app.include_router(health_router)
 
 
 @app.on_event("startup")
@@ -45,19 +124,26 @@ def test_db_connection():
         print(e)
 
 
-@app.get("/health")
-def read_health():
-    db_ok = True
+@app.on_event("startup")
+def start_background_tasks():
+    configure_password_hashing()
+
+    # Load revocations before serving; later syncs are incremental
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-    except Exception:
-        db_ok = False
+        revocation_list.sync_with(SessionLocal)
+    except Exception as e:
+        print("❌ Initial revocation sync failed.")
+        print(e)
+
+    for task in background_tasks:
+        task.start()
+
 
-    return {
-        "status": "ok" if db_ok else "degraded",
-        "database": "ok" if db_ok else "down",
-    }
+@app.on_event("shutdown")
+def shutdown_background_work():
+    for task in background_tasks:
+        task.stop()
+    password_hash_pool.shutdown()
 
 
 @app.exception_handler(FastAPIHTTPException)
@@ -67,4 +153,5 @@ async def http_exception_handler(request: Request, exc: FastAPIHTTPException):
         content={
             "error": exc.detail,
         },
+        headers=getattr(exc, "headers", None),
     )
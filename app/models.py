@@ -3,15 +3,22 @@ from datetime import date, datetime
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     DateTime,
     ForeignKey,
     Date,
     Text,
+    LargeBinary,
+    Index,
+    DDL,
+    event,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from app.db.search import BOOK_DOCUMENT, LOG_DOCUMENT, SQLITE_CREATE, SQLITE_DROP
 from app.db.session import Base
 
 
@@ -22,10 +29,22 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Set by DELETE /auth/me; the row itself goes when the purge finishes
+    disabled_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    books = relationship("Book", back_populates="owner", cascade="all, delete-orphan")
-    reading_logs = relationship("ReadingLog", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes: the FKs cascade in the database, so deleting a
+    # parent never loads its children into the session
+    books = relationship(
+        "Book", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True
+    )
+    reading_logs = relationship(
+        "ReadingLog", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Ids of deleted users must never be handed out again: tokens and the
+    # account-wide revocation entry refer to users by id
+    __table_args__ = {"sqlite_autoincrement": True}
 
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email!r}>"
@@ -43,7 +62,24 @@ class Book(Base):
 
     # Relationships
     owner = relationship("User", back_populates="books")
-    reading_logs = relationship("ReadingLog", back_populates="book", cascade="all, delete-orphan")
+    reading_logs = relationship(
+        "ReadingLog", back_populates="book", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Every books query is scoped to its owner
+        Index("ix_books_user_id_id", user_id, id),
+        # Full-text search (SQLite uses the FTS5 table from app.db.search)
+        Index("ix_books_search", text(BOOK_DOCUMENT), postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        Index(
+            "ix_books_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self) -> str:
         return f"<Book id={self.id} title={self.title!r}>"
@@ -52,6 +88,13 @@ class Book(Base):
 class ReadingLog(Base):
     __tablename__ = "reading_logs"
 
+    # On Postgres the table is partitioned by date and its primary key is
+    # (id, date), since a partitioned table's keys must include the
+    # partition column. The model declares `id` alone on purpose: it is
+    # unique on its own (one sequence feeds every partition), the ORM
+    # identifies logs by it, and on SQLite it stays the autoincrementing
+    # rowid. alembic/env.py keeps autogenerate from reporting either this
+    # or the partitions as drift.
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
@@ -65,20 +108,144 @@ class ReadingLog(Base):
     user = relationship("User", back_populates="reading_logs")
     book = relationship("Book", back_populates="reading_logs")
 
+    __table_args__ = (
+        # Listing (newest first) and date-range totals; INCLUDE makes the
+        # summary SUM index-only on Postgres
+        Index(
+            "ix_reading_logs_user_date_id",
+            user_id,
+            date.desc(),
+            id.desc(),
+            postgresql_include=["pages_read"],
+        ),
+        # Per-book listing and totals
+        Index(
+            "ix_reading_logs_user_book_date",
+            user_id,
+            book_id,
+            date,
+            postgresql_include=["pages_read"],
+        ),
+        # ON DELETE CASCADE from books looks logs up by book_id alone
+        Index("ix_reading_logs_book_id", book_id),
+        Index("ix_reading_logs_search", text(LOG_DOCUMENT), postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<ReadingLog id={self.id} user_id={self.user_id} book_id={self.book_id}>"
 
+
+class ReadingDailyRollup(Base):
+    """
+    Pages and sessions per user, book and day, kept in step with
+    reading_logs by app.core.rollups in the same transaction as each
+    write. Aggregates read this instead of the raw logs.
+    """
+    __tablename__ = "reading_daily_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    pages = Column(Integer, nullable=False, default=0)
+    sessions = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Date-range totals across books (the primary key serves per-book ones)
+        Index(
+            "ix_reading_daily_rollups_user_date",
+            user_id,
+            date,
+            postgresql_include=["pages"],
+        ),
+        # ON DELETE CASCADE from books
+        Index("ix_reading_daily_rollups_book_id", book_id),
+    )
+
+
+# Search DDL that create_all can't express from the tables above
+event.listen(
+    Book.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for statement in SQLITE_CREATE:
+    event.listen(
+        ReadingLog.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in SQLITE_DROP:
+    event.listen(
+        Book.__table__, "after_drop", DDL(statement).execute_if(dialect="sqlite")
+    )
+
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
-    # Store only hash (never store raw token)
-    token_hash = Column(String(128), unique=True, index=True, nullable=False)
+    # Store only the raw SHA-256 digest (never store raw token)
+    token_hash = Column(LargeBinary(32), nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
-    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    # Indexed for the purge task, which deletes by either cutoff
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     user = relationship("User", backref="refresh_tokens")
+
+    __table_args__ = (
+        # Lookups only ever care about live tokens, so only those are indexed
+        Index(
+            "ix_refresh_tokens_live",
+            "token_hash",
+            unique=True,
+            postgresql_where=text("revoked_at IS NULL"),
+            sqlite_where=text("revoked_at IS NULL"),
+        ),
+    )
+
+
+class RevokedAccessToken(Base):
+    __tablename__ = "revoked_access_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+
+    # Row can be purged once the token itself would have expired
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # Workers sync their revocation filters by revoked_at
+    revoked_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+
+class UserDataVersion(Base):
+    """
+    Per-user counter bumped with every write to the user's books and
+    reading logs; read endpoints derive their ETags from it. Kept out of
+    `users` so bumps rewrite a narrow row and ETag checks don't read users.
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class AccountDeletion(Base):
+    """
+    A requested account deletion and its progress. The purge task removes
+    the user's data in batches and deletes the users row last; this record
+    is kept (it outlives the user, hence no foreign key).
+    """
+    __tablename__ = "account_deletions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, unique=True, nullable=False)
+    requested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    reading_logs_deleted = Column(Integer, nullable=False, default=0)
+    books_deleted = Column(Integer, nullable=False, default=0)
+    refresh_tokens_deleted = Column(Integer, nullable=False, default=0)
@@ -1,18 +1,33 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import DateTime, LargeBinary, insert, literal, select, update
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app import models
 from datetime import datetime
-from app.schemas import UserCreate, UserOut, LoginRequest, Token, RefreshRequest, TokenPair
+from app.schemas import (
+    AccountDeletionOut,
+    UserCreate,
+    UserOut,
+    LoginRequest,
+    Token,
+    RefreshRequest,
+    TokenPair,
+)
 from app.core.security import (
     get_password_hash,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     get_current_user,
+    Principal,
     hash_refresh_token,
     create_refresh_token,
-    refresh_token_expiry
+    refresh_token_expiry,
+    revoke_access_token,
+    revoke_user_tokens,
+    optional_oauth2_scheme,
 )
 
 router = APIRouter(
@@ -57,15 +72,32 @@ def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db),
 ):
-    user = db.query(models.User).filter(models.User.email == login_data.email).first()
+    # Disabled (deleted) accounts look like unknown ones
+    user = (
+        db.query(models.User)
+        .filter(
+            models.User.email == login_data.email,
+            models.User.disabled_at.is_(None),
+        )
+        .first()
+    )
 
-    if not user or not verify_password(login_data.password, user.password_hash):
+    verified, new_hash = (
+        verify_and_update_password(login_data.password, user.password_hash)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Stale hash (old scheme or cost): store the fresh one with this login
+    if new_hash:
+        user.password_hash = new_hash
+
     access_token = create_access_token(data={"sub": str(user.id)})
 
     # Create refresh token (raw) and store only hash
@@ -90,62 +122,135 @@ def login(
 
 
 @router.get("/me", response_model=UserOut)
-def read_current_user(current_user: models.User = Depends(get_current_user)):
+def read_current_user(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
+# ----- Delete account -----
+
+
+@router.delete(
+    "/me",
+    response_model=AccountDeletionOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def delete_current_user(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Delete the current account. It is disabled and every token revoked
+    right away; its books and reading logs, then the account itself, are
+    removed in the background (app.tasks.accounts).
+    """
+    deletion = (
+        db.query(models.AccountDeletion)
+        .filter(models.AccountDeletion.user_id == current_user.id)
+        .first()
+    )
+    if deletion is None:
+        deletion = models.AccountDeletion(user_id=current_user.id)
+        db.add(deletion)
+
+    db.execute(
+        update(models.User)
+        .where(models.User.id == current_user.id, models.User.disabled_at.is_(None))
+        .values(disabled_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    revoke_user_tokens(db, current_user.id)
+    db.commit()
+    db.refresh(deletion)
+    return deletion
+
+
 
 
 # ------ Refresh ------
 
+
+def _rotate_refresh_token(
+    db: Session,
+    old_hash: bytes,
+    new_hash: bytes,
+    now: datetime,
+    expires_at: datetime,
+) -> Optional[int]:
+    """
+    Revoke the presented refresh token and store its replacement.
+
+    The revoke is a conditional UPDATE (only live tokens match), so when the
+    same token is presented twice concurrently exactly one caller gets the
+    user id back; everyone else gets None.
+    """
+    revoke = (
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.token_hash == old_hash,
+            models.RefreshToken.revoked_at.is_(None),
+            models.RefreshToken.expires_at > now,
+        )
+        .values(revoked_at=now)
+        .returning(models.RefreshToken.user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        # One statement: UPDATE ... RETURNING feeds the INSERT through a CTE
+        revoked = revoke.cte("revoked")
+        rotate = (
+            insert(models.RefreshToken)
+            .from_select(
+                ["user_id", "token_hash", "expires_at"],
+                select(
+                    revoked.c.user_id,
+                    literal(new_hash, LargeBinary(32)),
+                    literal(expires_at, DateTime(timezone=True)),
+                ),
+            )
+            .returning(models.RefreshToken.user_id)
+        )
+        return db.execute(rotate).scalar()
+
+    # SQLite has no data-modifying CTEs; UPDATE ... RETURNING is still atomic
+    # and the INSERT shares its transaction.
+    user_id = db.execute(revoke).scalar()
+    if user_id is not None:
+        db.execute(
+            insert(models.RefreshToken).values(
+                user_id=user_id,
+                token_hash=new_hash,
+                expires_at=expires_at,
+            )
+        )
+    return user_id
+
+
 @router.post("/refresh", response_model=TokenPair)
 def refresh_tokens(
     body: RefreshRequest,
     db: Session = Depends(get_db),
 ):
-    now = datetime.utcnow()
-    token_hash = hash_refresh_token(body.refresh_token)
+    new_refresh_raw = create_refresh_token()
 
-    token_row = (
-        db.query(models.RefreshToken)
-        .filter(models.RefreshToken.token_hash == token_hash)
-        .first()
+    user_id = _rotate_refresh_token(
+        db,
+        old_hash=hash_refresh_token(body.refresh_token),
+        new_hash=hash_refresh_token(new_refresh_raw),
+        now=datetime.utcnow(),
+        expires_at=refresh_token_expiry(),
     )
-
-    if (
-        token_row is None
-        or token_row.revoked_at is not None
-        or token_row.expires_at <= now
-    ):
+    if user_id is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
 
-    user = db.query(models.User).filter(models.User.id == token_row.user_id).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-    # Rotate: revoke old token
-    token_row.revoked_at = now
-
-    # Create new refresh token row
-    new_refresh_raw = create_refresh_token()
-    new_row = models.RefreshToken(
-        user_id=user.id,
-        token_hash=hash_refresh_token(new_refresh_raw),
-        expires_at=refresh_token_expiry(),
-        revoked_at=None,
-    )
-    db.add(new_row)
-
-    # New access token
-    new_access = create_access_token(data={"sub": str(user.id)})
-
     db.commit()
 
     return {
-        "access_token": new_access,
+        "access_token": create_access_token(data={"sub": str(user_id)}),
         "refresh_token": new_refresh_raw,
         "token_type": "bearer",
     }
@@ -158,19 +263,28 @@ def refresh_tokens(
 def logout(
     body: RefreshRequest,
     db: Session = Depends(get_db),
+    access_token: Optional[str] = Depends(optional_oauth2_scheme),
 ):
     now = datetime.utcnow()
     token_hash = hash_refresh_token(body.refresh_token)
 
     token_row = (
         db.query(models.RefreshToken)
-        .filter(models.RefreshToken.token_hash == token_hash)
+        .filter(
+            models.RefreshToken.token_hash == token_hash,
+            models.RefreshToken.revoked_at.is_(None),
+        )
         .first()
     )
 
     # Even if it's missing, return 204 (idempotent logout)
-    if token_row and token_row.revoked_at is None:
+    if token_row:
         token_row.revoked_at = now
-        db.commit()
+
+    # Kill the access token too, if the client sent it
+    if access_token:
+        revoke_access_token(db, access_token)
+
+    db.commit()
 
     return
\ No newline at end of file
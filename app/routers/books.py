@@ -1,23 +1,36 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, delete, func
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.routing import get_read_db
 from app import models
-from app.schemas import BookCreate, BookUpdate, BookOut
-from app.core.security import get_current_user
+from app.schemas import BookCreate, BookUpdate, BookOut, BulkDeleteResult
+from app.core.security import Principal, get_current_user
+from app.core.etag import bump_data_version, check_not_modified
+from app.core.pagination import check_page_params, decode_cursor, set_next_cursor
+from app.core.projection import parse_fields, projected_response
+from app.core.rollups import delete_book_rollups
 
 router = APIRouter(
     prefix="/books",
     tags=["books"],
 )
 
+# Columns clients may select with ?fields=
+BOOK_FIELDS = ("id", "title", "author", "total_pages", "created_at")
+# Extras clients may ask for with ?include=
+BOOK_INCLUDES = ("progress",)
+# Most ids accepted by one DELETE /books
+MAX_BULK_DELETE = 1000
+
 
 def _get_user_book_or_404(
     book_id: int,
     db: Session,
-    current_user: models.User,
+    current_user: Principal,
 ) -> models.Book:
     book = (
         db.query(models.Book)
@@ -34,16 +47,70 @@ def _get_user_book_or_404(
         )
     return book
 
+
+def _parse_include(include: Optional[str]) -> set:
+    requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = requested - set(BOOK_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))} "
+                   f"(available: {', '.join(BOOK_INCLUDES)})",
+        )
+    return requested
+
+
+def _with_progress(query):
+    """
+    Add each book's reading totals to a books query: one LEFT JOIN over
+    the owner's daily rollups (one row per day read, not per log), grouped
+    by book.
+    """
+    rollup = models.ReadingDailyRollup
+    return (
+        query.add_columns(
+            func.coalesce(func.sum(rollup.pages), 0),
+            func.max(rollup.date),
+            func.coalesce(func.sum(rollup.sessions), 0),
+        )
+        .outerjoin(
+            rollup,
+            and_(
+                rollup.user_id == models.Book.user_id,
+                rollup.book_id == models.Book.id,
+            ),
+        )
+        .group_by(models.Book.id)
+    )
+
+
+def _book_with_progress(row) -> dict:
+    book, pages_read, last_read, log_count = row
+    percent = None
+    if book.total_pages:
+        percent = min(100.0, round(100 * pages_read / book.total_pages, 1))
+    return {
+        **BookOut.model_validate(book).model_dump(exclude={"progress"}),
+        "progress": {
+            "pages_read": pages_read,
+            "percent": percent,
+            "last_read": last_read,
+            "log_count": log_count,
+        },
+    }
+
 @router.post(
     "",
     response_model=BookOut,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_201_CREATED,
 )
 def create_book(
     book_in: BookCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    bump_data_version(db, current_user.id)
     book = models.Book(
         user_id=current_user.id,
         title=book_in.title,
@@ -58,35 +125,98 @@ def create_book(
 @router.get(
     "",
     response_model=List[BookOut],
+    response_model_exclude_unset=True,
 )
 def list_books(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated subset of {', '.join(BOOK_FIELDS)} (id is always included).",
+    ),
+    include: Optional[str] = Query(
+        None,
+        description="`progress`: pages read, percent, last read date and log count per book.",
+    ),
 ):
     """
-    List books for the current user.
-    Basic pagination with skip/limit.
+    List books for the current user, oldest first.
+    Pass the X-Next-Cursor response header back as `cursor` for the next
+    page (skip/limit still work, but deep pages cost more).
+    Supports If-None-Match.
     """
+    check_page_params(cursor, skip)
+    columns = parse_fields(fields, BOOK_FIELDS)
+    progress = "progress" in _parse_include(include)
+    if progress and columns is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields and include=progress can't be combined",
+        )
+    not_modified = check_not_modified(request, response, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
+    query = db.query(models.Book).filter(models.Book.user_id == current_user.id)
+    if columns is not None:
+        query = query.with_entities(*(getattr(models.Book, name) for name in columns))
+    if progress:
+        query = _with_progress(query)
+
+    if cursor is not None:
+        after = decode_cursor(cursor, {"id": int})["id"]
+        query = query.filter(models.Book.id > after)
+
     books = (
-        db.query(models.Book)
-        .filter(models.Book.user_id == current_user.id)
+        query.order_by(models.Book.id)
         .offset(skip)
-        .limit(limit)
+        .limit(limit + 1)
         .all()
     )
+    if progress:
+        books = set_next_cursor(response, books, limit, lambda row: {"id": row[0].id})
+        return [_book_with_progress(row) for row in books]
+
+    books = set_next_cursor(response, books, limit, lambda book: {"id": book.id})
+    if columns is not None:
+        return projected_response(books, columns, response)
     return books
 
 @router.get(
     "/{book_id}",
     response_model=BookOut,
+    response_model_exclude_unset=True,
 )
 def get_book(
     book_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    include: Optional[str] = Query(
+        None,
+        description="`progress`: pages read, percent, last read date and log count.",
+    ),
 ):
+    if "progress" in _parse_include(include):
+        row = (
+            _with_progress(db.query(models.Book))
+            .filter(
+                models.Book.id == book_id,
+                models.Book.user_id == current_user.id,
+            )
+            .first()
+        )
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found",
+            )
+        return _book_with_progress(row)
+
     book = _get_user_book_or_404(book_id, db, current_user)
     return book
 
@@ -94,13 +224,15 @@ def get_book(
 @router.put(
     "/{book_id}",
     response_model=BookOut,
+    response_model_exclude_unset=True,
 )
 def update_book(
     book_id: int,
     book_in: BookUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    bump_data_version(db, current_user.id)
     book = _get_user_book_or_404(book_id, db, current_user)
 
     # Apply updates only to provided fields
@@ -115,6 +247,66 @@ def update_book(
     db.refresh(book)
     return book
 
+def _delete_books(db: Session, user_id: int, book_ids: List[int]) -> int:
+    """
+    Delete the owner's books, their logs and daily rollups with set-based
+    DELETEs. Nothing is loaded into the session, so the cost doesn't depend
+    on how many logs a book has. Children go first explicitly: SQLite only
+    honours ON DELETE CASCADE with PRAGMA foreign_keys on.
+    """
+    db.execute(
+        delete(models.ReadingLog)
+        .where(
+            models.ReadingLog.user_id == user_id,
+            models.ReadingLog.book_id.in_(book_ids),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    delete_book_rollups(db, user_id, book_ids)
+    result = db.execute(
+        delete(models.Book)
+        .where(
+            models.Book.user_id == user_id,
+            models.Book.id.in_(book_ids),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+@router.delete(
+    "",
+    response_model=BulkDeleteResult,
+)
+def delete_books(
+    ids: List[int] = Query(
+        ...,
+        alias="id",
+        description=f"Book ids to delete (repeat the parameter, at most {MAX_BULK_DELETE}). "
+                    "Ids that don't exist or belong to someone else are ignored.",
+    ),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Delete several books, and all of their reading logs, in one request.
+    """
+    book_ids = sorted(set(ids))
+    if len(book_ids) > MAX_BULK_DELETE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_DELETE} ids per request",
+        )
+
+    # First, like every writer: it takes this user's write lock
+    bump_data_version(db, current_user.id)
+    deleted = _delete_books(db, current_user.id, book_ids)
+    if deleted:
+        db.commit()
+    else:
+        db.rollback()
+    return {"deleted": deleted}
+
 @router.delete(
     "/{book_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -122,13 +314,16 @@ def update_book(
 def delete_book(
     book_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    book = _get_user_book_or_404(book_id, db, current_user)
+    bump_data_version(db, current_user.id)
+    if not _delete_books(db, current_user.id, [book_id]):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Book not found",
+        )
 
-    db.delete(book)
     db.commit()
     # 204: empty response body
     return
-
-
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Response
+
+from app.db.health import health_prober
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+
+@router.get("/live")
+def read_liveness():
+    """
+    The process is up and serving requests. Never touches the database.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def read_readiness(response: Response):
+    """
+    Ready to take traffic: the primary answered the last (cached) probe.
+    503 otherwise. Includes pool saturation and replica status.
+    """
+    state = health_prober.snapshot()
+    ready = state["database"] == "ok"
+    response.status_code = 200 if ready else 503
+    response.headers["Cache-Control"] = "no-store"
+    return {"status": "ready" if ready else "unavailable", **state}
+
+
+@router.get("")
+def read_health():
+    """
+    Backwards-compatible summary, served from the same cached probe.
+    """
+    state = health_prober.snapshot()
+    db_ok = state["database"] == "ok"
+    return {
+        "status": "ok" if db_ok else "degraded",
+        "database": state["database"],
+    }
@@ -0,0 +1,260 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.core.config import settings
+from app.core.etag import bump_data_version
+from app.core.imports import FORMATS, ImportJob, detect_format, import_jobs, iter_rows
+from app.core.rollups import RollupDeltas
+from app.core.security import Principal, get_current_user
+from app.db.session import get_db
+from app.schemas import BookCreate, ImportSummary, ReadingLogCreate
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["imports"],
+)
+
+# (title, author) as compared across rows and against existing books
+BookKey = Tuple[str, str]
+
+
+class ParsedImportRow:
+    def __init__(
+        self,
+        row_number: int,
+        book_id: Optional[int],
+        book: Optional[BookCreate],
+        log: Optional[ReadingLogCreate],
+    ):
+        self.row_number = row_number
+        self.book_id = book_id
+        self.book = book
+        self.log = log
+
+    @property
+    def key(self) -> Optional[BookKey]:
+        if self.book is None:
+            return None
+        return _book_key(self.book.title, self.book.author)
+
+
+def _book_key(title: str, author: Optional[str]) -> BookKey:
+    return title.strip().casefold(), (author or "").strip().casefold()
+
+
+def _validation_message(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def _parse_row(row_number: int, row: Dict[str, Any]) -> ParsedImportRow:
+    """
+    A row names a book (book_id of an existing book, or title/author/...)
+    and, if it has a date, a reading session of that book. A dated row
+    without pages_read counts as reading the whole book.
+    """
+    book_id = None
+    book = None
+    if "book_id" in row:
+        try:
+            book_id = int(row["book_id"])
+        except (TypeError, ValueError):
+            raise ValueError("book_id: must be an integer")
+    else:
+        book = BookCreate.model_validate(
+            {field: row.get(field) for field in ("title", "author", "total_pages")}
+        )
+
+    log = None
+    if "date" in row:
+        pages_read = row.get("pages_read") or (book.total_pages if book else None)
+        if pages_read is None:
+            raise ValueError("pages_read: required to log a read of a book without total_pages")
+        log = ReadingLogCreate.model_validate({
+            "book_id": book_id or 0,  # resolved after the book is found or created
+            "pages_read": pages_read,
+            "date": str(row["date"]).replace("/", "-"),
+            "note": row.get("note"),
+        })
+    elif "pages_read" in row:
+        raise ValueError("date: required with pages_read")
+    elif book_id is not None:
+        raise ValueError("date: nothing to import for an existing book without a date")
+
+    return ParsedImportRow(row_number, book_id, book, log)
+
+
+def _import_batch(
+    db: Session,
+    user_id: int,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    job: ImportJob,
+    known_books: Dict[BookKey, int],
+) -> None:
+    """
+    Validate and insert one batch in one transaction: one query checks
+    the referenced book ids, one finds existing books by title, then one
+    multi-row INSERT each for books and reading logs, and one upsert of
+    the daily rollups.
+    """
+    # First, like every writer: it takes this user's write lock
+    bump_data_version(db, user_id)
+    now = datetime.utcnow()
+    parsed: List[ParsedImportRow] = []
+    for row_number, row in batch:
+        try:
+            parsed.append(_parse_row(row_number, row))
+        except ValidationError as e:
+            job.add_error(row_number, _validation_message(e))
+        except ValueError as e:
+            job.add_error(row_number, str(e))
+
+    # Ownership of explicitly referenced books
+    referenced = {row.book_id for row in parsed if row.book_id is not None}
+    owned = set()
+    if referenced:
+        owned = set(
+            db.scalars(
+                select(models.Book.id).where(
+                    models.Book.user_id == user_id,
+                    models.Book.id.in_(referenced),
+                )
+            )
+        )
+
+    # Books the user already has (matched on title + author). SQL narrows
+    # by the trimmed, lower-cased title; _book_key decides the match
+    titles = {
+        row.book.title.strip().lower()
+        for row in parsed
+        if row.key is not None and row.key not in known_books
+    }
+    if titles:
+        existing = db.execute(
+            select(models.Book.id, models.Book.title, models.Book.author).where(
+                models.Book.user_id == user_id,
+                func.lower(func.trim(models.Book.title)).in_(titles),
+            )
+        )
+        for book_id, title, author in existing:
+            known_books.setdefault(_book_key(title, author), book_id)
+
+    new_books: Dict[BookKey, BookCreate] = {}
+    for row in parsed:
+        if row.key is not None and row.key not in known_books:
+            new_books.setdefault(row.key, row.book)
+    if new_books:
+        created = db.execute(
+            insert(models.Book).returning(models.Book.id, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": user_id,
+                    "title": book.title,
+                    "author": book.author,
+                    "total_pages": book.total_pages,
+                    "created_at": now,
+                }
+                for book in new_books.values()
+            ],
+        ).scalars().all()
+        known_books.update(zip(new_books, created))
+        job.books_created += len(created)
+
+    logs = []
+    for row in parsed:
+        if row.log is None:
+            continue
+        book_id = known_books[row.key] if row.key is not None else row.book_id
+        if row.key is None and book_id not in owned:
+            job.add_error(row.row_number, "book_id: Book not found")
+            continue
+        logs.append({
+            "user_id": user_id,
+            "book_id": book_id,
+            "pages_read": row.log.pages_read,
+            "date": row.log.date,
+            "note": row.log.note,
+            "created_at": now,
+        })
+    if logs:
+        db.execute(insert(models.ReadingLog), logs)
+        job.logs_created += len(logs)
+
+        rollups = RollupDeltas()
+        for log in logs:
+            rollups.add(user_id, log["book_id"], log["date"], log["pages_read"])
+        rollups.apply(db)
+
+    db.commit()
+
+
+@router.post(
+    "",
+    response_model=ImportSummary,
+)
+async def import_library(
+    request: Request,
+    format: Optional[str] = Query(
+        None,
+        description="csv or ndjson; defaults to the Content-Type.",
+    ),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Import books and reading history from a CSV (our columns, or a
+    Goodreads / StoryGraph export) or NDJSON upload sent as the raw
+    request body. The body is parsed while it streams in and written in
+    batches of IMPORT_BATCH_SIZE rows, each committed on its own.
+    Invalid rows are skipped and reported; poll GET /imports for progress.
+    """
+    fmt = format or detect_format(request.headers.get("content-type", ""))
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format {fmt!r} (use csv or ndjson)",
+        )
+
+    job = import_jobs.start(current_user.id, fmt, settings.IMPORT_MAX_ERRORS)
+    known_books: Dict[BookKey, int] = {}
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    try:
+        async for row_number, row in iter_rows(request.stream(), fmt):
+            job.rows += 1
+            if isinstance(row, str):
+                job.add_error(row_number, row)
+                continue
+            batch.append((row_number, row))
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await run_in_threadpool(_import_batch, db, current_user.id, batch, job, known_books)
+                batch = []
+        if batch:
+            await run_in_threadpool(_import_batch, db, current_user.id, batch, job, known_books)
+    except Exception:
+        job.finish("failed")
+        raise
+
+    job.finish()
+    return job.summary()
+
+
+@router.get(
+    "",
+    response_model=List[ImportSummary],
+)
+def list_imports(
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    This worker's recent imports for the current user, newest first,
+    including ones still running.
+    """
+    return [job.summary() for job in import_jobs.for_user(current_user.id)]
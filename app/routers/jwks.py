@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Response
+
+from app.core import keys
+from app.core.config import settings
+
+router = APIRouter(
+    tags=["auth"],
+)
+
+
+@router.get("/.well-known/jwks.json")
+def read_jwks(response: Response):
+    """
+    Public keys for verifying access tokens offline.
+    Empty when tokens are signed with a shared secret (HS*).
+    """
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}"
+    )
+    if keys.key_ring is None:
+        return {"keys": []}
+    return keys.key_ring.jwks()
@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+
+from app.core.hashing import password_hash_pool
+from app.core.rate_limit import rate_limiter
+from app.core.revocation import revocation_list
+from app.db.instrumentation import route_totals
+from app.db.routing import replica_router
+from app.db.session import pool_stats
+from app.core.security import principal_cache
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get("")
+def read_metrics():
+    """
+    In-process counters for this worker (caches, pools, limiters, queries).
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hash_pool": password_hash_pool.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "revocation_list": revocation_list.stats(),
+        "db_pool": pool_stats(),
+        "read_replicas": replica_router.status(),
+        "queries_by_route": route_totals.stats(),
+    }
@@ -1,14 +1,29 @@
-from datetime import date
+from datetime import date, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import numpy as np
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.routing import get_read_db
 from app import models
-from app.schemas import ReadingLogCreate, ReadingLogUpdate, ReadingLogOut
-from app.core.security import get_current_user
-from sqlalchemy import func
+from app.schemas import ReadingAnalytics, ReadingLogCreate, ReadingLogUpdate, ReadingLogOut
+from app.core.security import Principal, get_current_user
+from app.core.etag import bump_data_version, check_not_modified
+from app.core.pagination import check_page_params, decode_cursor, set_next_cursor
+from app.core.projection import parse_fields, projected_response
+from app.core.rollups import RollupDeltas
+from app.core.analytics import (
+    BUCKETS,
+    GROUPS,
+    PACE_DAYS,
+    project_finish,
+    reading_series,
+    to_columns,
+)
+from sqlalchemy import and_, func, select, tuple_
 
 
 router = APIRouter(
@@ -16,38 +31,218 @@ router = APIRouter(
     tags=["reading-logs"],
 )
 
+# Columns clients may select with ?fields=
+READING_LOG_FIELDS = ("id", "book_id", "pages_read", "date", "note", "created_at")
+# Longest range /analytics accepts
+ANALYTICS_MAX_DAYS = 3660
+
 @router.get(
     "/summary",
 )
 def get_reading_summary(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     book_id: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
 ):
     """
     Return simple stats: total pages read (optionally filtered).
+    Reads the daily rollup, so the cost follows days read, not logs.
+    Supports If-None-Match.
     """
-    query = db.query(func.sum(models.ReadingLog.pages_read)).filter(
-        models.ReadingLog.user_id == current_user.id
-    )
+    not_modified = check_not_modified(request, response, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
+    rollup = models.ReadingDailyRollup
+    query = db.query(func.sum(rollup.pages)).filter(rollup.user_id == current_user.id)
 
     if book_id is not None:
-        query = query.filter(models.ReadingLog.book_id == book_id)
+        query = query.filter(rollup.book_id == book_id)
     if date_from is not None:
-        query = query.filter(models.ReadingLog.date >= date_from)
+        query = query.filter(rollup.date >= date_from)
     if date_to is not None:
-        query = query.filter(models.ReadingLog.date <= date_to)
+        query = query.filter(rollup.date <= date_to)
 
     total_pages = query.scalar() or 0
 
     return {"total_pages_read": int(total_pages)}
 
+@router.get(
+    "/analytics",
+    response_model=ReadingAnalytics,
+)
+def get_reading_analytics(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    bucket: str = Query("day", description="`day`, `week` (starting Monday) or `month`."),
+    group_by: Optional[str] = Query(
+        None, description="`book` or `author`: one series per group read in the range."
+    ),
+    book_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, description="Defaults to a year before date_to."),
+    date_to: Optional[date] = Query(None, description="Defaults to today."),
+    window: int = Query(7, ge=1, le=366, description="Moving average window, in buckets."),
+):
+    """
+    Chart data: pages and sessions per bucket with a trailing moving
+    average and pace, plus a projected finish date for every book in
+    progress (at its pace over the PACE_DAYS days up to date_to).
+    One query over the daily rollups, computed with NumPy.
+    Supports If-None-Match.
+    """
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(BUCKETS)}",
+        )
+    if group_by is not None and group_by not in GROUPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of: {', '.join(GROUPS)}",
+        )
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=364)
+    if not 0 <= (date_to - date_from).days < ANALYTICS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"date_from must be before date_to and at most {ANALYTICS_MAX_DAYS} days apart",
+        )
+    # The defaults move with the calendar, not with the URL
+    not_modified = check_not_modified(
+        request, response, db, current_user.id, vary=f"{date_from}:{date_to}"
+    )
+    if not_modified is not None:
+        return not_modified
+
+    rollup = models.ReadingDailyRollup
+    pace_from = date_to - timedelta(days=PACE_DAYS - 1)
+    rows = select(rollup.date, rollup.book_id, rollup.pages, rollup.sessions).where(
+        rollup.user_id == current_user.id,
+        rollup.date >= min(date_from, pace_from),
+        rollup.date <= date_to,
+    )
+    books = (
+        select(
+            models.Book.id,
+            models.Book.title,
+            func.coalesce(models.Book.author, ""),
+            models.Book.total_pages,
+            func.coalesce(func.sum(rollup.pages), 0),
+        )
+        .outerjoin(
+            rollup,
+            and_(
+                rollup.user_id == models.Book.user_id,
+                rollup.book_id == models.Book.id,
+                rollup.date <= date_to,
+            ),
+        )
+        .where(models.Book.user_id == current_user.id)
+        .group_by(models.Book.id)
+        .order_by(models.Book.id)
+    )
+    if book_id is not None:
+        rows = rows.where(rollup.book_id == book_id)
+        books = books.where(models.Book.id == book_id)
+
+    days, row_books, pages, sessions = to_columns(
+        db.execute(rows).all(), ("datetime64[D]", "int64", "int64", "int64")
+    )
+    ids, titles, authors, total_pages, pages_read = to_columns(
+        db.execute(books).all(), ("int64", "object", "object", "float64", "int64")
+    )
+    # Rows of a book deleted between the two statements have no book to
+    # be attributed to; drop them
+    book_index = np.searchsorted(ids, row_books)
+    known = book_index < len(ids)
+    known[known] = ids[book_index[known]] == row_books[known]
+    days, pages, sessions, book_index = (
+        column[known] for column in (days, pages, sessions, book_index)
+    )
+
+    if group_by == "book":
+        groups, group_count = book_index, len(ids)
+    elif group_by == "author":
+        names, author_index = np.unique(authors.astype(str), return_inverse=True)
+        groups, group_count = author_index[book_index], len(names)
+    else:
+        groups, group_count = np.zeros_like(book_index), 1
+
+    in_range = days >= np.datetime64(date_from)
+    series = reading_series(
+        days[in_range],
+        groups[in_range],
+        group_count,
+        pages[in_range],
+        sessions[in_range],
+        date_from,
+        date_to,
+        bucket,
+        window,
+    )
+
+    recent = days >= np.datetime64(pace_from)
+    recent_pages = np.bincount(
+        book_index[recent], weights=pages[recent], minlength=len(ids)
+    )
+    projection = project_finish(pages_read, total_pages, recent_pages)
+    in_progress = (pages_read > 0) & (projection["remaining_pages"] > 0)
+
+    def label(g: int) -> dict:
+        if group_by == "book":
+            return {"book_id": int(ids[g]), "title": titles[g], "author": authors[g] or None}
+        if group_by == "author":
+            return {"author": names[g] or None}
+        return {}
+
+    shown = np.flatnonzero(series["total_pages"]) if group_by else [0]
+    return {
+        "bucket": bucket,
+        "date_from": date_from,
+        "date_to": date_to,
+        "buckets": series["buckets"].tolist(),
+        "series": [
+            {
+                **label(g),
+                "pages": series["pages"][g].tolist(),
+                "sessions": series["sessions"][g].tolist(),
+                "moving_average": series["moving_average"][g].round(2).tolist(),
+                "total_pages": int(series["total_pages"][g]),
+                "active_days": int(series["active_days"][g]),
+                "pages_per_day": round(float(series["pages_per_day"][g]), 2),
+                "pages_per_active_day": round(float(series["pages_per_active_day"][g]), 2),
+            }
+            for g in shown
+        ],
+        "projections": [
+            {
+                "book_id": int(ids[b]),
+                "title": titles[b],
+                "total_pages": int(total_pages[b]),
+                "pages_read": int(pages_read[b]),
+                "remaining_pages": int(projection["remaining_pages"][b]),
+                "pages_per_day": round(float(projection["pages_per_day"][b]), 2),
+                "projected_finish": (
+                    None
+                    if np.isnan(projection["days_left"][b])
+                    else date_to + timedelta(days=int(projection["days_left"][b]))
+                ),
+            }
+            for b in np.flatnonzero(in_progress)
+        ],
+    }
+
+
 def _get_user_log_or_404(
     log_id: int,
     db: Session,
-    current_user: models.User,
+    current_user: Principal,
 ) -> models.ReadingLog:
     log = (
         db.query(models.ReadingLog)
@@ -68,7 +263,7 @@ def _get_user_log_or_404(
 def _get_user_book_or_404(
     book_id: int,
     db: Session,
-    current_user: models.User,
+    current_user: Principal,
 ) -> models.Book:
     book = (
         db.query(models.Book)
@@ -94,8 +289,10 @@ def _get_user_book_or_404(
 def create_reading_log(
     log_in: ReadingLogCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    # First: serialises this user's writers (see app.core.rollups)
+    bump_data_version(db, current_user.id)
     # Ensure the book belongs to the current user
     _get_user_book_or_404(log_in.book_id, db, current_user)
 
@@ -108,6 +305,10 @@ def create_reading_log(
     )
 
     db.add(log)
+    db.flush()
+    rollups = RollupDeltas()
+    rollups.add(log.user_id, log.book_id, log.date, log.pages_read)
+    rollups.apply(db)
     db.commit()
     db.refresh(log)
     return log
@@ -118,21 +319,42 @@ def create_reading_log(
     response_model=List[ReadingLogOut],
 )
 def list_reading_logs(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     book_id: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            f"Comma-separated subset of {', '.join(READING_LOG_FIELDS)} "
+            "(id and date are always included)."
+        ),
+    ),
 ):
     """
-    List reading logs for current user.
+    List reading logs for current user, newest first.
     Optional filters: book_id, date range.
+    Pass the X-Next-Cursor response header back as `cursor` for the next
+    page (skip/limit still work, but deep pages cost more).
+    Supports If-None-Match.
     """
+    check_page_params(cursor, skip)
+    columns = parse_fields(fields, READING_LOG_FIELDS, always=("id", "date"))
+    not_modified = check_not_modified(request, response, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
     query = db.query(models.ReadingLog).filter(
         models.ReadingLog.user_id == current_user.id
     )
+    if columns is not None:
+        query = query.with_entities(*(getattr(models.ReadingLog, name) for name in columns))
 
     if book_id is not None:
         query = query.filter(models.ReadingLog.book_id == book_id)
@@ -143,11 +365,25 @@ def list_reading_logs(
     if date_to is not None:
         query = query.filter(models.ReadingLog.date <= date_to)
 
-    logs = query.order_by(models.ReadingLog.date.desc()) \
+    if cursor is not None:
+        after = decode_cursor(cursor, {"date": date.fromisoformat, "id": int})
+        # Row comparison: one range scan on ix_reading_logs_user_date_id
+        query = query.filter(
+            tuple_(models.ReadingLog.date, models.ReadingLog.id)
+            < tuple_(after["date"], after["id"])
+        )
+
+    # id breaks ties between logs on the same day, so pages never overlap
+    logs = query.order_by(models.ReadingLog.date.desc(), models.ReadingLog.id.desc()) \
                 .offset(skip) \
-                .limit(limit) \
+                .limit(limit + 1) \
                 .all()
 
+    logs = set_next_cursor(
+        response, logs, limit, lambda log: {"date": log.date.isoformat(), "id": log.id}
+    )
+    if columns is not None:
+        return projected_response(logs, columns, response)
     return logs
 
 @router.get(
@@ -156,8 +392,8 @@ def list_reading_logs(
 )
 def get_reading_log(
     log_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     log = _get_user_log_or_404(log_id, db, current_user)
     return log
@@ -170,9 +406,14 @@ def update_reading_log(
     log_id: int,
     log_in: ReadingLogUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    # Lock first, then read: the old values subtracted below can't be
+    # changed by a concurrent update before we commit
+    bump_data_version(db, current_user.id)
     log = _get_user_log_or_404(log_id, db, current_user)
+    rollups = RollupDeltas()
+    rollups.remove(log.user_id, log.book_id, log.date, log.pages_read)
 
     if log_in.book_id is not None:
         # Ensure new book (if provided) belongs to the current user
@@ -188,6 +429,8 @@ def update_reading_log(
     if log_in.note is not None:
         log.note = log_in.note
 
+    rollups.add(log.user_id, log.book_id, log.date, log.pages_read)
+    rollups.apply(db)
     db.commit()
     db.refresh(log)
     return log
@@ -200,11 +443,15 @@ def update_reading_log(
 def delete_reading_log(
     log_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    bump_data_version(db, current_user.id)
     log = _get_user_log_or_404(log_id, db, current_user)
 
     db.delete(log)
+    rollups = RollupDeltas()
+    rollups.remove(log.user_id, log.book_id, log.date, log.pages_read)
+    rollups.apply(db)
     db.commit()
     return
 
@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.security import Principal, get_current_user
+from app.db.routing import get_read_db
+from app.db.search import (
+    BOOK_DOCUMENT,
+    LOG_DOCUMENT,
+    MARK_START,
+    MARK_STOP,
+    SEARCH_CONFIG,
+    fts5_match,
+    highlighted,
+    search_terms,
+    tsquery,
+)
+from app.schemas import SearchHit
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+)
+
+# Hits are ordered by score (higher is better), then by `key`, which
+# identifies the row across both kinds: books id * 2, logs id * 2 + 1
+AFTER_CURSOR = """
+    WHERE hits.score < :after_score
+       OR (hits.score = :after_score AND hits.key > :after_key)
+"""
+
+SQLITE_SEARCH = """
+    SELECT hits.key, hits.score, hits.title, hits.author, hits.note,
+           reading_logs.book_id, reading_logs.date
+    FROM (
+        SELECT search_index.rowid AS key,
+               -bm25(search_index, 0.0, 10.0, 5.0, 1.0) AS score,
+               highlight(search_index, 1, :mark_start, :mark_stop) AS title,
+               highlight(search_index, 2, :mark_start, :mark_stop) AS author,
+               snippet(search_index, 3, :mark_start, :mark_stop, '…', 16) AS note
+        FROM search_index
+        WHERE search_index MATCH :match
+    ) AS hits
+    LEFT JOIN reading_logs ON hits.key % 2 = 1 AND reading_logs.id = hits.key / 2
+    {after_cursor}
+    ORDER BY hits.score DESC, hits.key
+    LIMIT :limit
+"""
+
+# Headlines are computed for the returned page only, after the LIMIT
+POSTGRES_SEARCH = f"""
+    WITH q AS (SELECT to_tsquery('{SEARCH_CONFIG}', :tsquery) AS query)
+    SELECT page.key, page.score, page.book_id, page.date,
+           ts_headline('{SEARCH_CONFIG}', page.title, q.query, :headline) AS title,
+           ts_headline('{SEARCH_CONFIG}', page.author, q.query, :headline) AS author,
+           ts_headline('{SEARCH_CONFIG}', page.note, q.query, :snippet) AS note
+    FROM (
+        SELECT hits.* FROM (
+            SELECT books.id * 2 AS key, books.id AS book_id, NULL::date AS date,
+                   greatest(ts_rank({BOOK_DOCUMENT}, q.query),
+                            similarity(books.title, :raw)) AS score,
+                   books.title, books.author, NULL::text AS note
+            FROM books, q
+            WHERE books.user_id = :user_id
+              AND ({BOOK_DOCUMENT} @@ q.query OR books.title % :raw)
+            UNION ALL
+            SELECT reading_logs.id * 2 + 1, reading_logs.book_id, reading_logs.date,
+                   ts_rank({LOG_DOCUMENT}, q.query),
+                   NULL, NULL, reading_logs.note
+            FROM reading_logs, q
+            WHERE reading_logs.user_id = :user_id
+              AND {LOG_DOCUMENT} @@ q.query
+        ) AS hits
+        {{after_cursor}}
+        ORDER BY hits.score DESC, hits.key
+        LIMIT :limit
+    ) AS page, q
+    ORDER BY page.score DESC, page.key
+"""
+
+HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_STOP}, HighlightAll=true"
+SNIPPET_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_STOP}, MaxWords=16, MinWords=8"
+
+
+def _hit(row: Any) -> Dict[str, Any]:
+    is_book = row.key % 2 == 0
+    return {
+        "kind": "book" if is_book else "reading_log",
+        "id": row.key // 2,
+        "book_id": row.key // 2 if is_book else row.book_id,
+        "score": row.score,
+        "title": highlighted(row.title),
+        "author": highlighted(row.author),
+        "note": highlighted(row.note),
+        "date": row.date,
+    }
+
+
+@router.get(
+    "",
+    response_model=List[SearchHit],
+)
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search the current user's book titles, authors and reading-log notes.
+    Every word must match (as a prefix); on Postgres, titles also match
+    fuzzily (trigram similarity). Best matches first; pass the
+    X-Next-Cursor response header back as `cursor` for the next page.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+
+    params: Dict[str, Any] = {"limit": limit + 1}
+    after_cursor = ""
+    if cursor is not None:
+        after = decode_cursor(cursor, {"score": float, "key": int})
+        params.update(after_score=after["score"], after_key=after["key"])
+        after_cursor = AFTER_CURSOR
+
+    if db.get_bind().dialect.name == "postgresql":
+        params.update(
+            tsquery=tsquery(terms),
+            raw=" ".join(terms),
+            user_id=current_user.id,
+            headline=HEADLINE_OPTIONS,
+            snippet=SNIPPET_OPTIONS,
+        )
+        sql = POSTGRES_SEARCH.format(after_cursor=after_cursor)
+    else:
+        params.update(
+            match=fts5_match(current_user.id, terms),
+            mark_start=MARK_START,
+            mark_stop=MARK_STOP,
+        )
+        sql = SQLITE_SEARCH.format(after_cursor=after_cursor)
+    rows = db.execute(text(sql), params).all()
+
+    rows = set_next_cursor(
+        response, rows, limit, lambda row: {"score": row.score, "key": row.key}
+    )
+    return [_hit(row) for row in rows]
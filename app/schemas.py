@@ -26,6 +26,18 @@ class UserOut(UserBase):
         from_attributes = True  # Pydantic v2; in v1 this is orm_mode = True
 
 
+class AccountDeletionOut(BaseModel):
+    id: int
+    requested_at: datetime
+    finished_at: Optional[datetime] = None
+    reading_logs_deleted: int
+    books_deleted: int
+    refresh_tokens_deleted: int
+
+    class Config:
+        from_attributes = True
+
+
 # ----- Auth Schemas -----
 
 
@@ -87,14 +99,30 @@ class BookUpdate(BaseModel):
     total_pages: Optional[int] = None
 
 
+class BookProgress(BaseModel):
+    pages_read: int
+    percent: Optional[float] = Field(
+        None,
+        description="pages_read / total_pages, capped at 100 (null without total_pages).",
+    )
+    last_read: Optional[DateType] = None
+    log_count: int
+
+
 class BookOut(BookBase):
     id: int
     created_at: datetime
+    # Only present with ?include=progress
+    progress: Optional[BookProgress] = None
 
     class Config:
         from_attributes = True  # Pydantic v2; orm_mode=True in v1
 
 
+class BulkDeleteResult(BaseModel):
+    deleted: int
+
+
 # ----- Reading Log Schemas -----
 
 
@@ -154,3 +182,85 @@ class ReadingLogOut(BaseModel):
 
     class Config:
         from_attributes = True  # Pydantic v2 (orm_mode=True in v1)
+
+
+# ----- Search Schemas -----
+
+
+class SearchHit(BaseModel):
+    """
+    One search result: a book (title/author) or a reading log (note).
+    title/author/note are HTML: the text escaped, with matched words
+    wrapped in <mark>...</mark>.
+    """
+    kind: str  # "book" | "reading_log"
+    id: int
+    book_id: int
+    score: float
+    title: Optional[str] = None
+    author: Optional[str] = None
+    note: Optional[str] = None
+    date: Optional[DateType] = None
+
+
+# ----- Import Schemas -----
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportSummary(BaseModel):
+    id: str
+    format: str
+    status: str  # "running" | "done" | "failed"
+    rows: int
+    books_created: int
+    logs_created: int
+    error_count: int
+    errors: List[ImportRowError] = Field(
+        default_factory=list,
+        description="The first IMPORT_MAX_ERRORS row errors.",
+    )
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+# ----- Analytics Schemas -----
+
+
+class AnalyticsSeries(BaseModel):
+    # Set according to group_by (neither when ungrouped)
+    book_id: Optional[int] = None
+    title: Optional[str] = None
+    author: Optional[str] = None
+
+    # One value per bucket
+    pages: List[int]
+    sessions: List[int]
+    moving_average: List[float]
+
+    total_pages: int
+    active_days: int
+    pages_per_day: float
+    pages_per_active_day: float
+
+
+class BookProjection(BaseModel):
+    book_id: int
+    title: str
+    total_pages: int
+    pages_read: int
+    remaining_pages: int
+    pages_per_day: float = Field(..., description="Average over the last 28 days.")
+    projected_finish: Optional[DateType] = None
+
+
+class ReadingAnalytics(BaseModel):
+    bucket: str
+    date_from: DateType
+    date_to: DateType
+    buckets: List[DateType] = Field(..., description="First day of each bucket.")
+    series: List[AnalyticsSeries]
+    projections: List[BookProjection]
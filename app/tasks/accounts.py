@@ -0,0 +1,109 @@
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.rollups import delete_book_rollups
+
+logger = logging.getLogger(__name__)
+
+# Tables purged batch by batch, children first, with the AccountDeletion
+# counter each one advances
+PURGE_STEPS = (
+    (models.ReadingLog, "reading_logs_deleted"),
+    (models.Book, "books_deleted"),
+    (models.RefreshToken, "refresh_tokens_deleted"),
+)
+
+
+def purge_deleted_accounts(
+    session_factory: Callable[[], Session],
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> int:
+    """
+    Remove the data of every account whose deletion is still pending.
+
+    Each table is emptied in batches of `batch_size` rows, one short
+    transaction per batch with a `pause_seconds` sleep in between, so a
+    heavy account never holds locks for long. Progress is committed with
+    every batch, so an interrupted purge resumes where it stopped. The
+    users row goes last. Returns the number of accounts finished.
+    """
+    if batch_size is None:
+        batch_size = settings.ACCOUNT_PURGE_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.ACCOUNT_PURGE_PAUSE_SECONDS
+
+    db = session_factory()
+    try:
+        pending = db.execute(
+            select(models.AccountDeletion.id, models.AccountDeletion.user_id)
+            .where(models.AccountDeletion.finished_at.is_(None))
+            .order_by(models.AccountDeletion.id)
+        ).all()
+    finally:
+        db.close()
+
+    for deletion_id, user_id in pending:
+        _purge_account(session_factory, deletion_id, user_id, batch_size, pause_seconds)
+    return len(pending)
+
+
+def _purge_account(
+    session_factory: Callable[[], Session],
+    deletion_id: int,
+    user_id: int,
+    batch_size: int,
+    pause_seconds: float,
+) -> None:
+    progress = models.AccountDeletion
+
+    for model, counter in PURGE_STEPS:
+        while True:
+            db = session_factory()
+            try:
+                ids = db.execute(
+                    select(model.id).where(model.user_id == user_id).limit(batch_size)
+                ).scalars().all()
+                if ids:
+                    if model is models.Book:
+                        # Rollup rows have no id of their own; they go with their books
+                        delete_book_rollups(db, user_id, ids)
+                    deleted = db.execute(
+                        delete(model).where(model.user_id == user_id, model.id.in_(ids))
+                    ).rowcount
+                    db.execute(
+                        update(progress)
+                        .where(progress.id == deletion_id)
+                        .values({counter: getattr(progress, counter) + deleted})
+                    )
+                    db.commit()
+            finally:
+                db.close()
+
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause_seconds)
+
+    db = session_factory()
+    try:
+        db.execute(
+            delete(models.UserDataVersion).where(models.UserDataVersion.user_id == user_id)
+        )
+        db.execute(delete(models.User).where(models.User.id == user_id))
+        db.execute(
+            update(progress)
+            .where(progress.id == deletion_id)
+            .values(finished_at=datetime.utcnow())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    logger.info("Purged account %d", user_id)
@@ -0,0 +1,174 @@
+"""
+Monthly range partitions of reading_logs (Postgres only).
+
+The partitioning migration turns reading_logs into a table partitioned
+by `date`. This module keeps it healthy:
+
+  - ensure_reading_log_partitions(): create the partitions for the next
+    READING_LOG_PARTITIONS_AHEAD months. Rows that landed
+    in the DEFAULT partition for such a month are moved into it first.
+  - detach_reading_log_partitions(): detach (and optionally drop) monthly
+    partitions that ended more than `older_than_months` ago. The legacy
+    partition holding everything from before the migration goes the same
+    way once its upper bound falls past the cutoff.
+
+On any other database both are no-ops.
+"""
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT = "reading_logs"
+DEFAULT_PARTITION = "reading_logs_default"
+LEGACY_PARTITION = "reading_logs_legacy"
+PARTITION_NAME = re.compile(r"^reading_logs_y(\d{4})m(\d{2})$")
+# Upper bound in pg_get_expr(relpartbound), e.g.
+# FOR VALUES FROM (MINVALUE) TO ('2026-11-01')
+UPPER_BOUND = re.compile(r"TO \('(\d{4})-(\d{2})-(\d{2})'\)")
+
+
+def add_months(day: date, months: int) -> date:
+    """
+    First day of the month `months` after `day`'s month.
+    """
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"{PARENT}_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def partition_bounds(month_start: date) -> Tuple[date, date]:
+    return month_start, add_months(month_start, 1)
+
+
+def _is_postgres(engine: Engine) -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def _partition_end(name: str, bound: str) -> Optional[date]:
+    """
+    Exclusive end of a partition's range; None for DEFAULT and anything
+    else this module doesn't manage.
+    """
+    match = PARTITION_NAME.match(name)
+    if match:
+        return partition_bounds(date(int(match.group(1)), int(match.group(2)), 1))[1]
+    if name == LEGACY_PARTITION:
+        match = UPPER_BOUND.search(bound or "")
+        if match:
+            return date(*(int(part) for part in match.groups()))
+    return None
+
+
+def ensure_reading_log_partitions(
+    engine: Engine,
+    months_ahead: Optional[int] = None,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Create missing monthly partitions for the next `months_ahead` months.
+    Returns the names of the partitions created.
+
+    The current month is left alone: it already exists, either from an
+    earlier run or as part of the legacy partition the migration attached
+    (which a new partition would overlap).
+    """
+    if not _is_postgres(engine):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.READING_LOG_PARTITIONS_AHEAD
+    this_month = add_months(today or date.today(), 0)
+
+    created = []
+    for offset in range(1, months_ahead + 1):
+        start, end = partition_bounds(add_months(this_month, offset))
+        name = partition_name(start)
+
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+            if exists:
+                continue
+
+            # Built detached, filled from DEFAULT, then attached: attaching
+            # only has to check the (small) DEFAULT partition and the new one
+            conn.execute(text(
+                f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE date >= :start AND date < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                {"start": start, "end": end},
+            )
+            conn.execute(text(
+                f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+        created.append(name)
+
+    if created:
+        logger.info("Created reading_logs partitions: %s", ", ".join(created))
+    return created
+
+
+def detach_reading_log_partitions(
+    engine: Engine,
+    older_than_months: int,
+    drop: bool = False,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Detach monthly partitions whose range ended more than
+    `older_than_months` months ago; drop them too if `drop`. The legacy
+    partition counts as one range ending at the migration's boundary, so
+    pre-partitioning history is retired in one piece once all of it is
+    past the cutoff.
+
+    Uses a short lock_timeout: DETACH needs a brief exclusive lock on the
+    parent, and it is better to give up and retry on the next run than to
+    queue every reading_logs query behind it.
+    """
+    if not _is_postgres(engine) or older_than_months <= 0:
+        return []
+    cutoff = add_months(today or date.today(), -older_than_months)
+
+    with engine.connect() as conn:
+        children = conn.execute(text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ), {"parent": PARENT}).all()
+
+    detached = []
+    for name, bound in sorted(children):
+        end = _partition_end(name, bound)
+        if end is None or end > cutoff:
+            continue
+
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            if drop:
+                conn.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+
+    if detached:
+        logger.info("Detached reading_logs partitions: %s", ", ".join(detached))
+    return detached
+
+
+def maintain_reading_log_partitions(engine: Engine) -> None:
+    ensure_reading_log_partitions(engine)
+    detach_reading_log_partitions(engine, settings.READING_LOG_RETENTION_MONTHS)
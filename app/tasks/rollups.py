@@ -0,0 +1,79 @@
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.etag import bump_data_version
+from app.core.rollups import RollupDeltas
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_reading_rollups(
+    session_factory: Callable[[], Session],
+    user_id: Optional[int] = None,
+) -> int:
+    """
+    Recompute reading_daily_rollups from reading_logs and correct the rows
+    that differ, one user per transaction (all users unless `user_id` is
+    given). Returns the number of rows corrected.
+    """
+    db = session_factory()
+    try:
+        if user_id is None:
+            user_ids = db.scalars(select(models.User.id).order_by(models.User.id)).all()
+        else:
+            user_ids = [user_id]
+    finally:
+        db.close()
+
+    corrected = 0
+    for uid in user_ids:
+        corrected += _reconcile_user(session_factory, uid)
+
+    if corrected:
+        logger.warning("Corrected %d reading rollup rows", corrected)
+    return corrected
+
+
+def _reconcile_user(session_factory: Callable[[], Session], user_id: int) -> int:
+    log = models.ReadingLog
+    rollup = models.ReadingDailyRollup
+
+    db = session_factory()
+    try:
+        # Every log write takes this row lock before touching logs or
+        # rollups, so none can run between our reads and our commit (and
+        # cached summaries revalidate)
+        bump_data_version(db, user_id)
+
+        expected = {
+            (book_id, day): (pages, sessions)
+            for book_id, day, pages, sessions in db.execute(
+                select(log.book_id, log.date, func.sum(log.pages_read), func.count())
+                .where(log.user_id == user_id)
+                .group_by(log.book_id, log.date)
+            )
+        }
+        stored = {
+            (book_id, day): (pages, sessions)
+            for book_id, day, pages, sessions in db.execute(
+                select(rollup.book_id, rollup.date, rollup.pages, rollup.sessions)
+                .where(rollup.user_id == user_id)
+            )
+        }
+
+        deltas = RollupDeltas()
+        for key in expected.keys() | stored.keys():
+            pages, sessions = expected.get(key, (0, 0))
+            stored_pages, stored_sessions = stored.get(key, (0, 0))
+            deltas.adjust(user_id, *key, pages - stored_pages, sessions - stored_sessions)
+
+        corrected = len(deltas)
+        deltas.apply(db)
+        db.commit()
+    finally:
+        db.close()
+    return corrected
@@ -0,0 +1,86 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def purge_refresh_tokens(
+    session_factory: Callable[[], Session],
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> int:
+    """
+    Delete refresh tokens that expired or were revoked more than
+    `retention_days` ago.
+
+    Rows go in batches of `batch_size`, one short transaction per batch,
+    with a `pause_seconds` sleep in between so the purge never holds locks
+    for long or saturates the database. Returns the number of rows deleted.
+    """
+    if retention_days is None:
+        retention_days = settings.REFRESH_TOKEN_RETENTION_DAYS
+    if batch_size is None:
+        batch_size = settings.REFRESH_TOKEN_PURGE_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.REFRESH_TOKEN_PURGE_PAUSE_SECONDS
+
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    stale = or_(
+        models.RefreshToken.expires_at < cutoff,
+        models.RefreshToken.revoked_at < cutoff,
+    )
+
+    deleted = 0
+    while True:
+        db = session_factory()
+        try:
+            ids = db.execute(
+                select(models.RefreshToken.id).where(stale).limit(batch_size)
+            ).scalars().all()
+            if ids:
+                db.execute(
+                    delete(models.RefreshToken).where(models.RefreshToken.id.in_(ids))
+                )
+                db.commit()
+        finally:
+            db.close()
+
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause_seconds)
+
+    if deleted:
+        logger.info("Purged %d refresh tokens", deleted)
+    return deleted
+
+
+def purge_revoked_access_tokens(session_factory: Callable[[], Session]) -> int:
+    """
+    Drop revocation records for access tokens that have expired anyway.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(
+            delete(models.RevokedAccessToken).where(
+                models.RevokedAccessToken.expires_at < datetime.utcnow()
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    return result.rowcount
+
+
+def purge_expired_tokens(session_factory: Callable[[], Session]) -> None:
+    purge_refresh_tokens(session_factory)
+    purge_revoked_access_tokens(session_factory)
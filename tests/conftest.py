@@ -1,5 +1,6 @@
 # tests/conftest.py
-from typing import Generator
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Generator, List
 
 import pytest
 from fastapi.testclient import TestClient
@@ -9,6 +10,8 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.db.session import Base, get_db
 from app import models
+from app.core.rate_limit import rate_limiter
+from app.db.instrumentation import QueryStats, add_listener, instrument_queries, remove_listener
 
 
 # Use SQLite for tests (in-memory or file). Here we'll use a file-based DB.
@@ -19,6 +22,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False},  # needed for SQLite + SQLAlchemy
     future=True,
 )
+instrument_queries(engine)
 
 TestingSessionLocal = sessionmaker(
     autocommit=False,
@@ -52,6 +56,15 @@ def override_get_db() -> Generator:
 app.dependency_overrides[get_db] = override_get_db
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> Generator:
+    """
+    Every test starts with full rate-limit buckets.
+    """
+    rate_limiter.reset()
+    yield
+
+
 @pytest.fixture
 def db() -> Generator:
     """
@@ -71,3 +84,35 @@ def client() -> TestClient:
     """
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[List[QueryStats]]]:
+    """
+    Fail when a request made inside the block runs more than `max_queries`
+    SQL statements:
+
+        with query_budget(3):
+            client.get("/books/", headers=headers)
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Generator:
+        requests: List[QueryStats] = []
+
+        def listener(stats: QueryStats) -> None:
+            requests.append(stats)
+
+        add_listener(listener)
+        try:
+            yield requests
+        finally:
+            remove_listener(listener)
+
+        for stats in requests:
+            assert stats.count <= max_queries, (
+                f"{stats.route} ran {stats.count} statements "
+                f"(budget {max_queries}):\n" + "\n".join(stats.statements)
+            )
+
+    return budget
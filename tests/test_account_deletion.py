@@ -0,0 +1,81 @@
+from fastapi.testclient import TestClient
+
+from app import models
+from app.tasks.accounts import purge_deleted_accounts
+from tests.conftest import TestingSessionLocal
+
+
+def _login(client: TestClient, email: str, password: str = "deletepassword"):
+    return client.post("/auth/login", json={"email": email, "password": password})
+
+
+def test_delete_account_revokes_tokens_then_purges_data(client: TestClient, db):
+    email = "leaving@example.com"
+    client.post("/auth/register", json={"email": email, "password": "deletepassword"})
+    first = _login(client, email).json()
+    second = _login(client, email).json()
+    headers = {"Authorization": f"Bearer {first['access_token']}"}
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    for title in ("One", "Two", "Three"):
+        book = client.post("/books", json={"title": title}, headers=headers).json()
+        for day in (1, 2):
+            client.post(
+                "/reading-logs",
+                json={"book_id": book["id"], "pages_read": 10, "date": f"2026-03-0{day}"},
+                headers=headers,
+            )
+
+    res = client.delete("/auth/me", headers=headers)
+    assert res.status_code == 202, res.text
+    assert res.json()["finished_at"] is None
+
+    # Every session is dead immediately, not just the one that asked
+    other_headers = {"Authorization": f"Bearer {second['access_token']}"}
+    assert client.get("/books", headers=headers).status_code == 401
+    assert client.get("/books", headers=other_headers).status_code == 401
+    res = client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert res.status_code == 401
+    assert _login(client, email).status_code == 401
+
+    # The data is still there until the purge runs
+    assert db.query(models.Book).filter(models.Book.user_id == user_id).count() == 3
+
+    assert purge_deleted_accounts(TestingSessionLocal, batch_size=2, pause_seconds=0) == 1
+
+    db.expire_all()
+    deletion = (
+        db.query(models.AccountDeletion)
+        .filter(models.AccountDeletion.user_id == user_id)
+        .one()
+    )
+    assert deletion.finished_at is not None
+    assert (
+        deletion.reading_logs_deleted,
+        deletion.books_deleted,
+        deletion.refresh_tokens_deleted,
+    ) == (6, 3, 2)
+    assert db.get(models.User, user_id) is None
+    assert db.query(models.ReadingLog).filter(models.ReadingLog.user_id == user_id).count() == 0
+
+    # Nothing left to do; the email can be registered again, under a new id
+    # that the old account's revocation doesn't touch
+    assert purge_deleted_accounts(TestingSessionLocal, pause_seconds=0) == 0
+    res = client.post("/auth/register", json={"email": email, "password": "deletepassword"})
+    assert res.status_code == 201
+    assert res.json()["id"] > user_id
+    headers = {"Authorization": f"Bearer {_login(client, email).json()['access_token']}"}
+    assert client.get("/books", headers=headers).json() == []
+
+
+def test_delete_account_leaves_other_users_alone(client: TestClient):
+    client.post("/auth/register", json={"email": "gone@example.com", "password": "deletepassword"})
+    client.post("/auth/register", json={"email": "stays@example.com", "password": "deletepassword"})
+    gone = {"Authorization": f"Bearer {_login(client, 'gone@example.com').json()['access_token']}"}
+    stays = {"Authorization": f"Bearer {_login(client, 'stays@example.com').json()['access_token']}"}
+    client.post("/books", json={"title": "Mine"}, headers=stays)
+
+    assert client.delete("/auth/me", headers=gone).status_code == 202
+    purge_deleted_accounts(TestingSessionLocal, pause_seconds=0)
+
+    assert [book["title"] for book in client.get("/books", headers=stays).json()] == ["Mine"]
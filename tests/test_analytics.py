@@ -0,0 +1,146 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app import models
+from tests.test_books import register_and_login
+
+
+def _setup(client: TestClient, email: str):
+    token = register_and_login(client, email, "chartspassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    books = {}
+    for title, author, total in (
+        ("Demian", "Hermann Hesse", 200),
+        ("Siddhartha", "Hermann Hesse", 150),
+        ("Essays", None, None),
+    ):
+        payload = {"title": title, "author": author, "total_pages": total}
+        books[title] = client.post("/books", json=payload, headers=headers).json()["id"]
+
+    for title, pages, day in (
+        ("Demian", 20, "2026-06-01"),  # Monday
+        ("Demian", 10, "2026-06-01"),
+        ("Siddhartha", 30, "2026-06-03"),
+        ("Demian", 40, "2026-06-08"),  # next Monday
+        ("Essays", 5, "2026-07-02"),
+    ):
+        client.post(
+            "/reading-logs",
+            json={"book_id": books[title], "pages_read": pages, "date": day},
+            headers=headers,
+        )
+    return headers, books
+
+
+def test_weekly_series_by_author_with_projections(client: TestClient):
+    headers, books = _setup(client, "weekly@example.com")
+
+    res = client.get(
+        "/reading-logs/analytics",
+        params={
+            "bucket": "week",
+            "group_by": "author",
+            "date_from": "2026-06-01",
+            "date_to": "2026-06-14",
+            "window": 2,
+        },
+        headers=headers,
+    )
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["buckets"] == ["2026-06-01", "2026-06-08"]
+    # Essays (no author) wasn't read in the range, so it has no series
+    [hesse] = data["series"]
+    assert hesse["author"] == "Hermann Hesse"
+    assert hesse["pages"] == [60, 40]
+    assert hesse["sessions"] == [3, 1]
+    assert hesse["moving_average"] == [60.0, 50.0]
+    assert hesse["active_days"] == 3
+    assert hesse["pages_per_day"] == round(100 / 14, 2)
+
+    projections = {p["book_id"]: p for p in data["projections"]}
+    assert set(projections) == {books["Demian"], books["Siddhartha"]}
+    demian = projections[books["Demian"]]
+    assert (demian["pages_read"], demian["remaining_pages"]) == (70, 130)
+    # 70 pages over the last 28 days: 2.5 a day, 52 days to go
+    assert demian["pages_per_day"] == 2.5
+    assert demian["projected_finish"] == "2026-08-05"
+
+
+def test_daily_and_monthly_series(client: TestClient):
+    headers, books = _setup(client, "monthly@example.com")
+
+    daily = client.get(
+        "/reading-logs/analytics",
+        params={"date_from": "2026-06-01", "date_to": "2026-06-03"},
+        headers=headers,
+    ).json()
+    assert daily["buckets"] == ["2026-06-01", "2026-06-02", "2026-06-03"]
+    [total] = daily["series"]
+    assert total["pages"] == [30, 0, 30]
+    assert total["moving_average"] == [30.0, 15.0, 20.0]
+
+    monthly = client.get(
+        "/reading-logs/analytics",
+        params={"bucket": "month", "group_by": "book", "date_from": "2026-05-15", "date_to": "2026-07-31"},
+        headers=headers,
+    ).json()
+    assert monthly["buckets"] == ["2026-05-01", "2026-06-01", "2026-07-01"]
+    by_book = {series["title"]: series["pages"] for series in monthly["series"]}
+    assert by_book == {"Demian": [0, 70, 0], "Siddhartha": [0, 30, 0], "Essays": [0, 0, 5]}
+
+    one_book = client.get(
+        "/reading-logs/analytics",
+        params={"book_id": books["Siddhartha"], "bucket": "month", "date_to": "2026-07-31"},
+        headers=headers,
+    ).json()
+    assert one_book["series"][0]["total_pages"] == 30
+    # Nothing read in the 28 days before date_to: no pace, no projection date
+    assert one_book["projections"][0]["projected_finish"] is None
+
+
+def test_analytics_validation_and_etag(client: TestClient):
+    headers, _ = _setup(client, "chartlimits@example.com")
+
+    for params in (
+        {"bucket": "year"},
+        {"group_by": "genre"},
+        {"date_from": "2026-06-02", "date_to": "2026-06-01"},
+        {"date_from": "2000-01-01", "date_to": "2026-06-01"},
+    ):
+        res = client.get("/reading-logs/analytics", params=params, headers=headers)
+        assert res.status_code == 400, params
+
+    res = client.get("/reading-logs/analytics", headers=headers)
+    assert res.status_code == 200
+    assert len(res.json()["buckets"]) == 365
+    res = client.get(
+        "/reading-logs/analytics", headers={**headers, "If-None-Match": res.headers["ETag"]}
+    )
+    assert res.status_code == 304
+
+
+def test_rollups_of_a_vanished_book_are_ignored(client: TestClient, db):
+    headers, books = _setup(client, "vanished@example.com")
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+    # As if the book was deleted between the rollup and book queries
+    rollup = models.ReadingDailyRollup
+    vanished = (0, max(books.values()) + 1000)
+    for book_id in vanished:
+        db.add(rollup(user_id=user_id, book_id=book_id, date=date(2026, 6, 2), pages=500, sessions=1))
+    db.commit()
+
+    try:
+        res = client.get(
+            "/reading-logs/analytics",
+            params={"group_by": "book", "date_from": "2026-06-01", "date_to": "2026-06-03"},
+            headers=headers,
+        )
+    finally:
+        # Other tests rebuild every user's rollups
+        db.query(rollup).filter(rollup.book_id.in_(vanished)).delete()
+        db.commit()
+    assert res.status_code == 200, res.text
+    by_book = {series["book_id"]: series["pages"] for series in res.json()["series"]}
+    assert by_book == {books["Demian"]: [30, 0, 0], books["Siddhartha"]: [0, 0, 30]}
@@ -0,0 +1,73 @@
+from typing import AsyncGenerator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.async_bridge import mirror_router
+from app.db.session import async_database_url, get_async_db
+from app.main import http_exception_handler
+from app.routers.auth import router as auth_router
+from app.routers.books import router as books_router
+from app.routers.reading_logs import router as reading_logs_router
+from fastapi.exceptions import HTTPException as FastAPIHTTPException
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+@pytest.fixture
+def async_client() -> TestClient:
+    async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL))
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_exception_handler(FastAPIHTTPException, http_exception_handler)
+    for router in (auth_router, books_router, reading_logs_router):
+        app.include_router(mirror_router(router))
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as c:
+        yield c
+
+
+def test_async_driver_urls():
+    assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db:5432/app")
+        == "postgresql+asyncpg://u:p@db:5432/app"
+    )
+
+
+def test_async_routes_serve_same_api(async_client: TestClient):
+    payload = {"email": "async@example.com", "password": "asyncpassword"}
+    res = async_client.post("/auth/register", json=payload)
+    assert res.status_code == 201, res.text
+    res = async_client.post("/auth/login", json=payload)
+    assert res.status_code == 200, res.text
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    res = async_client.post("/books", json={"title": "Async Book", "total_pages": 100}, headers=headers)
+    assert res.status_code == 201, res.text
+    book_id = res.json()["id"]
+
+    res = async_client.post(
+        "/reading-logs",
+        json={"book_id": book_id, "pages_read": 12, "date": "2026-01-02"},
+        headers=headers,
+    )
+    assert res.status_code == 201, res.text
+
+    res = async_client.get("/reading-logs/summary", headers=headers)
+    assert res.json() == {"total_pages_read": 12}
+
+    res = async_client.get("/books/999999", headers=headers)
+    assert res.status_code == 404
+    assert res.json() == {"error": "Book not found"}
+
+    assert async_client.get("/auth/me", headers=headers).json()["email"] == payload["email"]
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+from tests.test_books import register_and_login
+
+
+def test_books_include_progress_in_one_query(client: TestClient, query_budget):
+    token = register_and_login(client, "progress@example.com", "progresspassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    started = client.post("/books", json={"title": "Started", "total_pages": 200}, headers=headers).json()
+    unread = client.post("/books", json={"title": "Unread", "total_pages": 100}, headers=headers).json()
+    unknown = client.post("/books", json={"title": "No page count"}, headers=headers).json()
+    assert "progress" not in started
+
+    for day, pages in (("2026-04-01", 30), ("2026-04-03", 20)):
+        client.post(
+            "/reading-logs",
+            json={"book_id": started["id"], "pages_read": pages, "date": day},
+            headers=headers,
+        )
+    client.post(
+        "/reading-logs",
+        json={"book_id": unknown["id"], "pages_read": 12, "date": "2026-04-02"},
+        headers=headers,
+    )
+
+    # data_version lookup + the one grouped query
+    with query_budget(2):
+        res = client.get("/books?include=progress", headers=headers)
+    assert res.status_code == 200, res.text
+    progress = {book["id"]: book["progress"] for book in res.json()}
+    assert progress == {
+        started["id"]: {"pages_read": 50, "percent": 25.0, "last_read": "2026-04-03", "log_count": 2},
+        unread["id"]: {"pages_read": 0, "percent": 0.0, "last_read": None, "log_count": 0},
+        unknown["id"]: {"pages_read": 12, "percent": None, "last_read": "2026-04-02", "log_count": 1},
+    }
+
+    book = client.get(f"/books/{started['id']}?include=progress", headers=headers).json()
+    assert book["title"] == "Started"
+    assert book["progress"]["pages_read"] == 50
+
+    # Paging still works with progress
+    res = client.get("/books?include=progress&limit=2", headers=headers)
+    assert len(res.json()) == 2
+    assert "X-Next-Cursor" in res.headers
+
+    # Plain responses are unchanged
+    assert "progress" not in client.get("/books", headers=headers).json()[0]
+    assert client.get("/books?include=shelves", headers=headers).status_code == 400
+    assert client.get("/books/999999?include=progress", headers=headers).status_code == 404
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+from tests.test_books import register_and_login
+
+
+def _book_with_logs(client: TestClient, headers, title: str, logs: int) -> int:
+    book = client.post("/books", json={"title": title}, headers=headers).json()
+    for day in range(1, logs + 1):
+        res = client.post(
+            "/reading-logs",
+            json={"book_id": book["id"], "pages_read": 5, "date": f"2026-02-{day:02d}"},
+            headers=headers,
+        )
+        assert res.status_code == 201, res.text
+    return book["id"]
+
+
+def test_delete_book_does_not_load_its_logs(client: TestClient, query_budget):
+    token = register_and_login(client, "cascade@example.com", "cascadepassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    book_id = _book_with_logs(client, headers, "Well read", 20)
+
+    # DELETE logs, rollups and book + data_version bump, however many logs exist
+    with query_budget(4) as requests:
+        res = client.delete(f"/books/{book_id}", headers=headers)
+    assert res.status_code == 204
+    assert not any("SELECT" in statement for statement in requests[0].statements)
+
+    assert client.get(f"/books/{book_id}", headers=headers).status_code == 404
+    assert client.get("/reading-logs", headers=headers).json() == []
+    assert client.delete(f"/books/{book_id}", headers=headers).status_code == 404
+
+
+def test_bulk_delete_books(client: TestClient, query_budget):
+    token = register_and_login(client, "bulkdelete@example.com", "bulkpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    first = _book_with_logs(client, headers, "First", 3)
+    second = _book_with_logs(client, headers, "Second", 2)
+    kept = _book_with_logs(client, headers, "Kept", 1)
+
+    other = register_and_login(client, "bulkother@example.com", "bulkpassword")
+    other_headers = {"Authorization": f"Bearer {other}"}
+    foreign = _book_with_logs(client, other_headers, "Not yours", 1)
+
+    with query_budget(4):
+        res = client.delete(
+            "/books",
+            params={"id": [first, second, foreign, 999999]},
+            headers=headers,
+        )
+    assert res.status_code == 200, res.text
+    assert res.json() == {"deleted": 2}
+
+    assert [book["id"] for book in client.get("/books", headers=headers).json()] == [kept]
+    assert {log["book_id"] for log in client.get("/reading-logs", headers=headers).json()} == {kept}
+    assert client.get(f"/books/{foreign}", headers=other_headers).status_code == 200
+
+
+def test_bulk_delete_limits(client: TestClient, monkeypatch):
+    token = register_and_login(client, "bulklimit@example.com", "bulkpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.delete("/books", headers=headers).status_code == 422
+
+    monkeypatch.setattr("app.routers.books.MAX_BULK_DELETE", 2)
+    res = client.delete("/books", params={"id": [1, 2, 3]}, headers=headers)
+    assert res.status_code == 400
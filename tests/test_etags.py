@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+from tests.test_books import register_and_login
+
+
+def test_conditional_get_and_version_bumps(client: TestClient, query_budget):
+    token = register_and_login(client, "etag@example.com", "etagpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    book_id = client.post("/books", json={"title": "ETag"}, headers=headers).json()["id"]
+
+    res = client.get("/books", headers=headers)
+    etag = res.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert res.headers["Cache-Control"] == "private, no-cache"
+
+    # Unchanged: 304 after the version lookup alone
+    with query_budget(1):
+        res = client.get("/books", headers={**headers, "If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.content == b""
+    assert res.headers["ETag"] == etag
+
+    # Another URL is another representation
+    other = client.get("/books?limit=1", headers=headers).headers["ETag"]
+    assert other != etag
+
+    # Any write to books or logs invalidates every ETag of the user
+    summary_etag = client.get("/reading-logs/summary", headers=headers).headers["ETag"]
+    client.post(
+        "/reading-logs",
+        json={"book_id": book_id, "pages_read": 3, "date": "2026-05-01"},
+        headers=headers,
+    )
+    res = client.get("/books", headers={**headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    res = client.get("/reading-logs/summary", headers={**headers, "If-None-Match": summary_etag})
+    assert res.status_code == 200
+    assert res.json()["total_pages_read"] == 3
+
+    # Projected responses carry the ETag as well
+    res = client.get("/reading-logs?fields=date", headers=headers)
+    res = client.get("/reading-logs?fields=date", headers={**headers, "If-None-Match": res.headers["ETag"]})
+    assert res.status_code == 304
+
+
+def test_etags_are_per_user(client: TestClient):
+    first = {"Authorization": f"Bearer {register_and_login(client, 'etag-a@example.com', 'etagpassword')}"}
+    second = {"Authorization": f"Bearer {register_and_login(client, 'etag-b@example.com', 'etagpassword')}"}
+
+    etag = client.get("/reading-logs", headers=first).headers["ETag"]
+    res = client.get("/reading-logs", headers={**second, "If-None-Match": etag})
+    assert res.status_code == 200
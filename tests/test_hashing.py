@@ -0,0 +1,60 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core.hashing import (
+    HASHERS,
+    autotune_cost,
+    build_context,
+    check_password,
+    hash_password,
+    password_hash_pool,
+    password_policy,
+)
+
+
+def test_login_is_rejected_fast_when_hash_pool_is_full(client: TestClient, monkeypatch):
+    payload = {"email": "busy@example.com", "password": "password123"}
+    res = client.post("/auth/register", json=payload)
+    assert res.status_code == 201, res.text
+
+    # Simulate a pool whose every slot is already taken
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    monkeypatch.setattr(password_hash_pool, "_slots", full)
+
+    res = client.post("/auth/login", json=payload)
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "1"
+    assert "retry" in res.json()["error"]
+
+
+def test_hash_pool_round_trip():
+    hashed = hash_password("secret-pass")
+    assert check_password("secret-pass", hashed)
+    assert not check_password("wrong-pass", hashed)
+
+
+def test_login_rehashes_stale_password_hash(client: TestClient, db, monkeypatch):
+    # Stored with a weaker cost than the current policy
+    weak = build_context("bcrypt", 4).hash("password123")
+    user = models.User(email="rehash@example.com", password_hash=weak)
+    db.add(user)
+    db.commit()
+
+    monkeypatch.setattr(password_policy, "config", build_context("bcrypt", 5).to_string())
+    monkeypatch.setattr(password_policy, "context", build_context("bcrypt", 5))
+    assert password_policy.needs_update(weak)
+
+    res = client.post("/auth/login", json={"email": "rehash@example.com", "password": "password123"})
+    assert res.status_code == 200, res.text
+
+    db.refresh(user)
+    assert user.password_hash.startswith("$2b$05$")
+    assert not password_policy.needs_update(user.password_hash)
+
+
+def test_autotune_falls_back_to_min_cost():
+    # A tiny latency target can only be met by the cheapest cost
+    assert autotune_cost("bcrypt", 0.001) == HASHERS["bcrypt"].min_cost
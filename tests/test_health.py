@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.db.health import HealthProber, health_prober
+
+
+def test_liveness_never_queries(client: TestClient, query_budget):
+    with query_budget(0):
+        res = client.get("/health/live")
+    assert res.status_code == 200
+    assert res.json() == {"status": "alive"}
+
+
+def test_readiness_is_served_from_the_cached_probe(client: TestClient, query_budget):
+    health_prober.refresh()
+
+    with query_budget(0) as requests:
+        for _ in range(5):
+            res = client.get("/health/ready")
+            assert res.status_code == 200
+        legacy = client.get("/health")
+
+    assert len(requests) == 6
+    body = res.json()
+    assert body["status"] == "ready"
+    assert body["database"] == "ok"
+    assert "saturation" in body["pools"]["primary"]
+    assert body["read_replicas"] == []
+    assert legacy.json() == {"status": "ok", "database": "ok"}
+
+
+def test_expired_state_is_refreshed_once(monkeypatch):
+    prober = HealthProber(create_engine("sqlite://"), interval=60)
+    probes = []
+    original = prober.probe
+    monkeypatch.setattr(prober, "probe", lambda: probes.append(1) or original())
+
+    prober.snapshot()
+    prober.snapshot()
+    assert len(probes) == 1
+
+    prober.interval = 0
+    prober.snapshot()
+    assert len(probes) == 2
+
+
+def test_unreachable_database_is_reported():
+    prober = HealthProber(create_engine("sqlite:////nonexistent/dir/health.db"), interval=60)
+    state = prober.snapshot()
+    assert state["database"] == "down"
+    assert state["database_error"] == "OperationalError"
@@ -0,0 +1,90 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from tests.test_books import register_and_login
+
+GOODREADS_CSV = (
+    "Book Id,Title,Author,Number of Pages,Date Read,Exclusive Shelf,My Review\r\n"
+    "1,Demian,Hermann Hesse,200,2024/03/01,read,\"Loved it,\r\nespecially the ending\"\r\n"
+    "2,Siddhartha,Hermann Hesse,152,,to-read,\r\n"
+    "3,Steppenwolf,Hermann Hesse,,2024/05/02,read,\r\n"
+    "4,,Nobody,100,2024/01/01,read,\r\n"
+)
+
+
+def _headers(client: TestClient, email: str):
+    token = register_and_login(client, email, "importpassword")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_goodreads_csv_import(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    headers = _headers(client, "import@example.com")
+
+    def chunks():
+        # Small chunks split rows (and the multi-line review) mid-way
+        data = GOODREADS_CSV.encode()
+        for i in range(0, len(data), 7):
+            yield data[i:i + 7]
+
+    res = client.post(
+        "/imports", content=chunks(), headers={**headers, "Content-Type": "text/csv"}
+    )
+    assert res.status_code == 200, res.text
+    summary = res.json()
+    assert summary["status"] == "done"
+    assert summary["rows"] == 4
+    assert summary["books_created"] == 2
+    assert summary["logs_created"] == 1
+    assert summary["error_count"] == 2
+    assert [error["row"] for error in summary["errors"]] == [3, 4]
+
+    books = client.get("/books", headers=headers).json()
+    assert [book["title"] for book in books] == ["Demian", "Siddhartha"]
+    logs = client.get("/reading-logs", headers=headers).json()
+    assert len(logs) == 1
+    assert logs[0]["pages_read"] == 200
+    assert logs[0]["date"] == "2024-03-01"
+    assert logs[0]["note"] == "Loved it,\nespecially the ending"
+
+    jobs = client.get("/imports", headers=headers).json()
+    assert jobs[0]["id"] == summary["id"]
+
+
+def test_ndjson_import_reuses_books_and_checks_ownership(client: TestClient):
+    headers = _headers(client, "import-ndjson@example.com")
+    other = _headers(client, "import-other@example.com")
+    mine = client.post("/books", json={"title": "Existing"}, headers=headers).json()["id"]
+    dune = client.post(
+        "/books", json={"title": "dune", "author": "Herbert"}, headers=headers
+    ).json()["id"]
+    theirs = client.post("/books", json={"title": "Theirs"}, headers=other).json()["id"]
+
+    rows = [
+        {"title": "Existing", "date": "2025-01-01", "pages_read": 10},
+        {"title": " Dune ", "author": "herbert", "date": "2025-01-01", "pages_read": 3},
+        {"title": "New", "author": "A", "date": "2025-01-02", "pages_read": 5},
+        {"title": "new", "author": "a", "date": "2025-01-03", "pages_read": 6},
+        {"book_id": mine, "date": "2025-01-04", "pages_read": 7},
+        {"book_id": theirs, "date": "2025-01-05", "pages_read": 8},
+        {"title": "Bad pages", "date": "2025-01-06", "pages_read": -1},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+    res = client.post(
+        "/imports",
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    summary = res.json()
+    assert summary["books_created"] == 1
+    assert summary["logs_created"] == 5
+    assert sorted(error["row"] for error in summary["errors"]) == [6, 7, 8]
+
+    by_book = {}
+    for log in client.get("/reading-logs", headers=headers).json():
+        by_book.setdefault(log["book_id"], []).append(log["pages_read"])
+    assert sorted(by_book[mine]) == [7, 10]
+    assert by_book[dune] == [3]
+    assert theirs not in by_book
@@ -0,0 +1,53 @@
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+
+from app.core import keys
+
+
+def write_rsa_key(path) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+
+def test_tokens_verify_offline_with_jwks(client: TestClient, tmp_path, monkeypatch):
+    write_rsa_key(tmp_path / "2026-01.pem")
+    write_rsa_key(tmp_path / "2026-02.pem")
+    ring = keys.KeyRing.from_directory(str(tmp_path), "RS256")
+    assert ring.signing_key.kid == "2026-02"
+
+    # A token from the previous key must keep working after rotation
+    old_ring = keys.KeyRing.from_directory(str(tmp_path), "RS256", active_kid="2026-01")
+
+    monkeypatch.setattr(keys, "key_ring", ring)
+
+    client.post("/auth/register", json={"email": "jwks@example.com", "password": "password123"})
+    res = client.post("/auth/login", json={"email": "jwks@example.com", "password": "password123"})
+    access_token = res.json()["access_token"]
+    assert jwt.get_unverified_header(access_token)["kid"] == "2026-02"
+
+    res = client.get("/.well-known/jwks.json")
+    assert res.status_code == 200
+    assert "max-age=" in res.headers["Cache-Control"]
+    published = {key["kid"]: key for key in res.json()["keys"]}
+    assert set(published) == {"2026-01", "2026-02"}
+    assert "d" not in published["2026-02"]  # never leak private material
+
+    # Verify like a downstream service would: only the JWKS document
+    claims = jwt.decode(access_token, jwk.construct(published["2026-02"]), algorithms=["RS256"])
+    assert claims["sub"]
+
+    old_token = old_ring.encode({"sub": claims["sub"], "exp": claims["exp"]})
+    res = client.get("/auth/me", headers={"Authorization": f"Bearer {old_token}"})
+    assert res.status_code == 200, res.text
+
+
+def test_jwks_empty_for_shared_secret(client: TestClient):
+    assert client.get("/.well-known/jwks.json").json() == {"keys": []}
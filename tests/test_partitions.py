@@ -0,0 +1,114 @@
+import os
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.session import Base
+from app.tasks.partitions import (
+    PARTITION_NAME,
+    _partition_end,
+    add_months,
+    detach_reading_log_partitions,
+    ensure_reading_log_partitions,
+    partition_bounds,
+    partition_name,
+)
+from tests.conftest import engine
+
+
+def test_month_arithmetic_crosses_years():
+    assert add_months(date(2026, 10, 18), 0) == date(2026, 10, 1)
+    assert add_months(date(2026, 11, 30), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 5), -1) == date(2025, 12, 1)
+    assert partition_bounds(date(2026, 12, 1)) == (date(2026, 12, 1), date(2027, 1, 1))
+
+
+def test_partition_names_round_trip():
+    name = partition_name(date(2027, 3, 1))
+    assert name == "reading_logs_y2027m03"
+    assert PARTITION_NAME.match(name).groups() == ("2027", "03")
+    assert not PARTITION_NAME.match("reading_logs_legacy")
+
+
+def test_partition_ends():
+    assert _partition_end("reading_logs_y2026m12", "") == date(2027, 1, 1)
+    bound = "FOR VALUES FROM (MINVALUE) TO ('2026-11-01')"
+    assert _partition_end("reading_logs_legacy", bound) == date(2026, 11, 1)
+    assert _partition_end("reading_logs_default", "DEFAULT") is None
+
+
+def test_maintenance_is_a_noop_off_postgres():
+    assert ensure_reading_log_partitions(engine, months_ahead=3) == []
+    assert detach_reading_log_partitions(engine, older_than_months=1, drop=True) == []
+
+
+@pytest.fixture
+def postgres_engine():
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    engine = create_engine(url, future=True)
+    Base.metadata.create_all(bind=engine)
+    # The partitioning migration's end state, with a legacy partition
+    # holding everything before 2026-11
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE reading_logs RENAME TO reading_logs_legacy"))
+        conn.execute(text(
+            "CREATE TABLE reading_logs (LIKE reading_logs_legacy INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (date)"
+        ))
+        conn.execute(text(
+            "ALTER TABLE reading_logs ATTACH PARTITION reading_logs_legacy "
+            "FOR VALUES FROM (MINVALUE) TO ('2026-11-01')"
+        ))
+        conn.execute(text("CREATE TABLE reading_logs_default PARTITION OF reading_logs DEFAULT"))
+    try:
+        yield engine
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS reading_logs CASCADE"))
+            conn.execute(text("DROP TABLE IF EXISTS reading_logs_legacy CASCADE"))
+            conn.execute(text("DROP TABLE IF EXISTS reading_logs_y2026m11"))
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def _count(engine, table: str) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+
+def test_ensure_and_detach_on_postgres(postgres_engine):
+    engine = postgres_engine
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO reading_logs (user_id, book_id, pages_read, date, created_at) "
+                "VALUES (1, 1, 10, :day, :now)"
+            ),
+            [{"day": day, "now": datetime.utcnow()} for day in (date(2026, 10, 2), date(2026, 12, 5))],
+        )
+    assert _count(engine, "reading_logs_default") == 1
+
+    # Future months are created, and December's row moves out of DEFAULT
+    created = ensure_reading_log_partitions(engine, months_ahead=2, today=date(2026, 10, 18))
+    assert created == ["reading_logs_y2026m11", "reading_logs_y2026m12"]
+    assert _count(engine, "reading_logs_default") == 0
+    assert _count(engine, "reading_logs_y2026m12") == 1
+    assert ensure_reading_log_partitions(engine, months_ahead=2, today=date(2026, 10, 18)) == []
+
+    # The legacy partition goes once all of it is past the cutoff...
+    detached = detach_reading_log_partitions(engine, older_than_months=1, today=date(2026, 12, 15))
+    assert detached == ["reading_logs_legacy"]
+    assert _count(engine, "reading_logs") == 1
+    assert _count(engine, "reading_logs_legacy") == 1
+
+    # ...and monthly partitions the same way, dropped when asked
+    detached = detach_reading_log_partitions(
+        engine, older_than_months=1, drop=True, today=date(2027, 1, 10)
+    )
+    assert detached == ["reading_logs_y2026m11"]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT to_regclass('reading_logs_y2026m11')")).scalar() is None
+    assert _count(engine, "reading_logs") == 1
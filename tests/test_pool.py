@@ -0,0 +1,56 @@
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, engine_options, instrument_engine, pool_status
+
+
+def test_pool_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+    options = engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)
+    assert options["pool_size"] == 7
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+    # SQLite keeps its own pool class and takes no sizing arguments
+    assert "pool_size" not in engine_options("sqlite:///./x.db")
+
+
+def test_pool_telemetry_tracks_checkouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+    )
+    instrument_engine(engine)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 2
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 2
+    assert status["wait_histogram"]["le_inf"] == 2
+    assert status["connection_age_seconds"]["count"] == 2
+
+
+def test_detached_connections_stop_counting(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=2
+    )
+    instrument_engine(engine)
+
+    conn = engine.connect()
+    assert pool_status(engine)["connection_age_seconds"]["count"] == 1
+    conn.detach()
+    assert pool_status(engine)["connection_age_seconds"]["count"] == 0
+    conn.close()
+    assert pool_status(engine)["connection_age_seconds"]["count"] == 0
+
+    # The record reconnects for the next checkout and counts again
+    with engine.connect():
+        assert pool_status(engine)["connection_age_seconds"]["count"] == 1
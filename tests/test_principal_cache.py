@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.core.security import principal_cache
+from tests.conftest import engine
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> str:
+    client.post("/auth/register", json={"email": email, "password": password})
+    res = client.post("/auth/login", json={"email": email, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"]
+
+
+def count_user_queries(client: TestClient, path: str, headers: dict) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        res = client.get(path, headers=headers)
+        assert res.status_code == 200, res.text
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return sum(1 for s in statements if "FROM users" in s)
+
+
+def test_hot_paths_skip_auth_query_when_cached(client: TestClient):
+    token = register_and_login(client, "cache@example.com", "cachepassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # First call may warm the cache; later calls must not touch users
+    client.get("/books", headers=headers)
+    assert count_user_queries(client, "/books", headers) == 0
+    assert count_user_queries(client, "/reading-logs", headers) == 0
+    assert count_user_queries(client, "/reading-logs/summary", headers) == 0
+
+    stats = client.get("/metrics").json()["principal_cache"]
+    assert stats["hits"] >= 3
+
+
+def test_cache_entry_dropped_when_user_changes(client: TestClient, db):
+    token = register_and_login(client, "changing@example.com", "changingpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    me = client.get("/auth/me", headers=headers).json()
+    assert principal_cache.get(me["id"]) is not None
+
+    user = db.query(models.User).filter(models.User.id == me["id"]).first()
+    user.email = "changed@example.com"
+    db.commit()
+
+    assert principal_cache.get(me["id"]) is None
+    res = client.get("/auth/me", headers=headers)
+    assert res.json()["email"] == "changed@example.com"
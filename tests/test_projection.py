@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from tests.test_books import register_and_login
+
+
+def test_reading_logs_fields_projection(client: TestClient, query_budget):
+    token = register_and_login(client, "fields@example.com", "fieldspassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    book_id = client.post("/books", json={"title": "Fields"}, headers=headers).json()["id"]
+    for day in ("2026-03-01", "2026-03-02"):
+        client.post(
+            "/reading-logs",
+            json={"book_id": book_id, "pages_read": 5, "date": day, "note": "x" * 900},
+            headers=headers,
+        )
+
+    with query_budget(2) as requests:
+        res = client.get("/reading-logs?fields=pages_read&limit=1", headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json() == [{"id": res.json()[0]["id"], "pages_read": 5, "date": "2026-03-02"}]
+    # The note column is never selected
+    _, statement = requests[0].statements
+    assert "note" not in statement
+
+    # Cursor paging works the same with a projection
+    cursor = res.headers["X-Next-Cursor"]
+    res = client.get(f"/reading-logs?fields=pages_read&cursor={cursor}", headers=headers)
+    assert [log["date"] for log in res.json()] == ["2026-03-01"]
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_books_fields_projection(client: TestClient):
+    token = register_and_login(client, "fields-books@example.com", "fieldspassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/books", json={"title": "Only title", "author": "A"}, headers=headers)
+
+    books = client.get("/books?fields=title,created_at", headers=headers).json()
+    assert list(books[0]) == ["id", "title", "created_at"]
+
+    res = client.get("/books?fields=title,user_id", headers=headers)
+    assert res.status_code == 400
+    assert "user_id" in res.json()["error"]
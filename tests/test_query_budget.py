@@ -0,0 +1,64 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.instrumentation import track_queries
+from tests.test_books import register_and_login
+
+
+def test_endpoints_stay_within_query_budget(client: TestClient, query_budget):
+    token = register_and_login(client, "budget@example.com", "budgetpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Writes: lookup + INSERT/UPDATE + rollup upsert + data_version bump + refresh
+    with query_budget(5) as writes:
+        book = client.post(
+            "/books", json={"title": "Budget", "total_pages": 100}, headers=headers
+        ).json()
+        log = client.post(
+            "/reading-logs",
+            json={"book_id": book["id"], "pages_read": 10, "date": "2026-01-05"},
+            headers=headers,
+        ).json()
+        client.put(f"/reading-logs/{log['id']}", json={"pages_read": 12}, headers=headers)
+
+    # Reads: data_version lookup + one statement, whatever the number of rows
+    with query_budget(2) as reads:
+        client.get("/books", headers=headers)
+        client.get(f"/books/{book['id']}", headers=headers)
+        client.get("/reading-logs", headers=headers)
+        client.get("/reading-logs/summary", headers=headers)
+
+    assert [stats.route for stats in writes] == [
+        "POST /books",
+        "POST /reading-logs",
+        "PUT /reading-logs/{log_id}",
+    ]
+    assert len(reads) == 4
+
+
+def test_repeated_statements_are_flagged(db):
+    with track_queries("test") as stats:
+        for _ in range(settings.N_PLUS_ONE_THRESHOLD):
+            db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+
+    assert stats.count == settings.N_PLUS_ONE_THRESHOLD + 1
+    assert list(stats.repeated(settings.N_PLUS_ONE_THRESHOLD).values()) == [
+        settings.N_PLUS_ONE_THRESHOLD
+    ]
+
+
+def test_slow_queries_are_logged(db, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.000001)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+        with track_queries("GET /slow"):
+            db.execute(text("SELECT :secret"), {"secret": "hunter2-hash"})
+
+    assert "Slow query" in caplog.text
+    assert "GET /slow" in caplog.text
+    assert "1 parameters" in caplog.text
+    assert "hunter2-hash" not in caplog.text
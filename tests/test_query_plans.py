@@ -0,0 +1,162 @@
+# tests/test_query_plans.py
+"""
+Query-plan regression tests.
+
+Every statement the routes run is captured and EXPLAINed; the test fails
+if any of them reads one of our tables with a full scan. Runs on SQLite
+always, and on Postgres when TEST_POSTGRES_URL points at a scratch
+database (its tables are created and dropped by the test).
+"""
+import json
+import os
+import re
+from typing import Dict, Generator, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base, get_db
+from app.main import app
+from tests.conftest import engine as sqlite_engine
+
+TABLES = ("users", "books", "reading_logs", "refresh_tokens", "revoked_access_tokens")
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (%s)\b" % "|".join(TABLES))
+
+
+def sqlite_full_scans(conn, statement, parameters) -> List[str]:
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [row[-1] for row in rows if SQLITE_FULL_SCAN.match(row[-1])]
+
+
+def postgres_full_scans(conn, statement, parameters) -> List[str]:
+    # Tiny test tables make a seq scan the cheapest plan; forbid it so the
+    # planner shows whether an index *can* serve the query
+    conn.exec_driver_sql("SET enable_seqscan = off")
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+
+    def walk(node: Dict) -> None:
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in TABLES:
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def backends() -> List[str]:
+    return ["sqlite", "postgresql"]
+
+
+@pytest.fixture(params=backends())
+def plan_client(request) -> Generator[Tuple[TestClient, object], None, None]:
+    if request.param == "sqlite":
+        engine = sqlite_engine
+        yield_tables = False
+    else:
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+        engine = create_engine(url, future=True)
+        Base.metadata.create_all(bind=engine)
+        yield_tables = True
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+    def override() -> Generator:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override
+    try:
+        with TestClient(app) as c:
+            yield c, engine
+    finally:
+        app.dependency_overrides[get_db] = previous
+        if yield_tables:
+            Base.metadata.drop_all(bind=engine)
+
+
+class StatementRecorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[Tuple[str, str, object]] = []
+        self.route = ""
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            self.statements.append((self.route, statement, parameters))
+
+
+def test_routes_never_full_scan(plan_client):
+    client, engine = plan_client
+    recorder = StatementRecorder(engine)
+
+    def call(method: str, path: str, **kwargs):
+        recorder.route = f"{method.upper()} {path}"
+        res = getattr(client, method)(path, **kwargs)
+        assert res.status_code < 400, (recorder.route, res.text)
+        return res
+
+    with recorder:
+        creds = {"email": "plans@example.com", "password": "planpassword"}
+        call("post", "/auth/register", json=creds)
+        tokens = call("post", "/auth/login", json=creds).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        call("get", "/auth/me", headers=headers)
+
+        book_id = call("post", "/books", json={"title": "Plan Book"}, headers=headers).json()["id"]
+        call("post", "/books", json={"title": "Plan Book B"}, headers=headers)
+        page = call("get", "/books?limit=1", headers=headers)
+        call("get", f"/books?cursor={page.headers['X-Next-Cursor']}", headers=headers)
+        call("get", f"/books/{book_id}", headers=headers)
+        call("get", "/books?include=progress", headers=headers)
+        call("get", f"/books/{book_id}?include=progress", headers=headers)
+        call("put", f"/books/{book_id}", json={"title": "Plan Book 2"}, headers=headers)
+
+        log = {"book_id": book_id, "pages_read": 10, "date": "2026-01-01"}
+        log_id = call("post", "/reading-logs", json=log, headers=headers).json()["id"]
+        call("post", "/reading-logs", json=log, headers=headers)
+        page = call("get", "/reading-logs?limit=1", headers=headers)
+        call("get", f"/reading-logs?cursor={page.headers['X-Next-Cursor']}", headers=headers)
+        call("get", f"/reading-logs?book_id={book_id}&date_from=2025-01-01", headers=headers)
+        call("get", f"/reading-logs/{log_id}", headers=headers)
+        call("get", "/search?q=plan", headers=headers)
+        call("put", f"/reading-logs/{log_id}", json={"pages_read": 12}, headers=headers)
+        call("get", "/reading-logs/summary", headers=headers)
+        call("get", f"/reading-logs/summary?book_id={book_id}&date_to=2026-12-31", headers=headers)
+        call("get", "/reading-logs/analytics?group_by=book&date_to=2026-06-30", headers=headers)
+        call("get", f"/reading-logs/analytics?book_id={book_id}&bucket=week", headers=headers)
+        call("delete", f"/reading-logs/{log_id}", headers=headers)
+
+        call("delete", f"/books/{book_id}", headers=headers)
+        tokens = call("post", "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+        call("post", "/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+
+    explain = sqlite_full_scans if engine.dialect.name == "sqlite" else postgres_full_scans
+    failures = []
+    with engine.connect() as conn:
+        for route, statement, parameters in recorder.statements:
+            scans = explain(conn, statement, parameters)
+            if scans:
+                failures.append(f"{route}: {scans}\n    {statement}")
+        conn.rollback()
+
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
@@ -0,0 +1,86 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import (
+    MAX_AUTH_BODY_BYTES,
+    RateLimit,
+    SQLiteBackend,
+    _buffer_body,
+    rate_limiter,
+)
+
+
+def test_login_limited_per_email_before_password_check(client: TestClient, monkeypatch):
+    monkeypatch.setitem(rate_limiter.limits, "auth_email", RateLimit(capacity=2, period=60))
+
+    def fail_if_called(*args, **kwargs):
+        raise AssertionError("password check must not run for limited requests")
+
+    payload = {"email": "Stuffed@example.com", "password": "wrongpassword"}
+    for _ in range(2):
+        res = client.post("/auth/login", json=payload)
+        assert res.status_code == 401
+
+    monkeypatch.setattr("app.routers.auth.verify_and_update_password", fail_if_called)
+    res = client.post("/auth/login", json={**payload, "email": "stuffed@example.com"})
+    assert res.status_code == 429
+    assert int(res.headers["Retry-After"]) >= 1
+
+    assert client.get("/metrics").json()["rate_limiter"]["limited"]["auth_email"] == 1
+
+
+def test_login_limited_per_ip(client: TestClient, monkeypatch):
+    monkeypatch.setitem(rate_limiter.limits, "auth_ip", RateLimit(capacity=1, period=60))
+
+    client.post("/auth/login", json={"email": "a@example.com", "password": "password123"})
+    res = client.post("/auth/login", json={"email": "b@example.com", "password": "password123"})
+    assert res.status_code == 429
+
+
+def test_authenticated_requests_limited_per_user(client: TestClient, monkeypatch):
+    client.post("/auth/register", json={"email": "busyuser@example.com", "password": "password123"})
+    res = client.post("/auth/login", json={"email": "busyuser@example.com", "password": "password123"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    monkeypatch.setitem(rate_limiter.limits, "user", RateLimit(capacity=2, period=60))
+    assert client.get("/books", headers=headers).status_code == 200
+    assert client.get("/books", headers=headers).status_code == 200
+    assert client.get("/books", headers=headers).status_code == 429
+
+
+def test_sqlite_backend_shares_buckets_between_instances(tmp_path):
+    path = str(tmp_path / "buckets.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    limit = RateLimit(capacity=1, period=60)
+
+    assert first.take("auth_ip:1.2.3.4", limit) == 0
+    assert second.take("auth_ip:1.2.3.4", limit) > 0
+
+
+def test_oversized_auth_body_is_not_buffered():
+    chunk = b"x" * (MAX_AUTH_BODY_BYTES // 4)
+    chunks = [chunk] * 20
+    received = []
+
+    async def receive():
+        received.append(chunks[len(received)])
+        return {
+            "type": "http.request",
+            "body": received[-1],
+            "more_body": len(received) < len(chunks),
+        }
+
+    async def run():
+        body, replay = await _buffer_body(receive)
+        # Stopped just past the limit instead of reading everything
+        assert body is None
+        assert len(received) == 5
+        replayed = []
+        while True:
+            message = await replay()
+            replayed.append(message["body"])
+            if not message["more_body"]:
+                return replayed
+
+    assert asyncio.run(run()) == chunks
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.db import routing
+from app.db.session import Base
+
+
+def register_and_login(client: TestClient, email: str, password: str) -> dict:
+    client.post("/auth/register", json={"email": email, "password": password})
+    res = client.post("/auth/login", json={"email": email, "password": password})
+    assert res.status_code == 200, res.text
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+@pytest.fixture
+def replica_url(tmp_path, monkeypatch) -> str:
+    # An (empty) replica: anything read from it is visibly different
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    monkeypatch.setattr(routing, "replica_router", routing.ReplicaRouter([url]))
+    routing.recent_writers.clear()
+    yield url
+    routing.recent_writers.clear()
+
+
+def test_reads_go_to_replica_except_right_after_a_write(client: TestClient, replica_url):
+    headers = register_and_login(client, "replica@example.com", "replicapassword")
+    res = client.post("/books", json={"title": "Fresh"}, headers=headers)
+    assert res.status_code == 201
+
+    # Just wrote: pinned to the primary, sees its own book
+    assert len(client.get("/books", headers=headers).json()) == 1
+
+    # Once the stickiness window is over reads hit the (empty) replica
+    routing.recent_writers.clear()
+    assert client.get("/books", headers=headers).json() == []
+    assert routing.replica_router.replica_reads == 1
+
+
+def test_unreachable_replica_fails_over_to_primary(client: TestClient, tmp_path, monkeypatch):
+    bad = f"sqlite:///{tmp_path / 'missing-dir' / 'replica.db'}"
+    router = routing.ReplicaRouter([bad])
+    monkeypatch.setattr(routing, "replica_router", router)
+
+    headers = register_and_login(client, "failover@example.com", "failoverpassword")
+    client.post("/books", json={"title": "Kept"}, headers=headers)
+    routing.recent_writers.clear()
+
+    assert len(client.get("/books", headers=headers).json()) == 1
+    assert not router.replicas[0].healthy
+    assert router.status()["primary_reads"] == 1
+
+
+def test_replica_status_leaves_out_the_url(replica_url):
+    # Served by the unauthenticated /metrics
+    [replica] = routing.replica_router.status()["replicas"]
+    assert replica["name"] == "replica-0"
+    assert "replica.db" not in str(replica)
@@ -1,5 +1,10 @@
+from datetime import datetime, timedelta
+
 from fastapi.testclient import TestClient
 
+from app.core.security import hash_refresh_token
+from app.routers.auth import _rotate_refresh_token
+
 
 def test_refresh_rotation(client: TestClient):
     # register + login
@@ -38,4 +43,20 @@ def test_logout_revokes_refresh(client: TestClient):
 
     # refresh should fail
     res = client.post("/auth/refresh", json={"refresh_token": refresh})
-    assert res.status_code == 401
\ No newline at end of file
+    assert res.status_code == 401
+
+def test_rotation_succeeds_only_once_per_token(client: TestClient, db):
+    client.post("/auth/register", json={"email": "race@example.com", "password": "password123"})
+    res = client.post("/auth/login", json={"email": "race@example.com", "password": "password123"})
+    old_hash = hash_refresh_token(res.json()["refresh_token"])
+
+    now = datetime.utcnow()
+    expires_at = now + timedelta(days=1)
+
+    first = _rotate_refresh_token(db, old_hash, hash_refresh_token("a"), now, expires_at)
+    db.commit()
+    second = _rotate_refresh_token(db, old_hash, hash_refresh_token("b"), now, expires_at)
+    db.commit()
+
+    assert first is not None
+    assert second is None
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app import models
+
+from app.core.revocation import BloomFilter, RevocationList
+from tests.conftest import TestingSessionLocal
+
+
+def test_logout_revokes_access_token_immediately(client: TestClient):
+    client.post("/auth/register", json={"email": "revoke@example.com", "password": "password123"})
+    res = client.post("/auth/login", json={"email": "revoke@example.com", "password": "password123"})
+    tokens = res.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    res = client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert res.status_code == 204
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+    # Another worker learns about it from the table
+    other_worker = RevocationList(capacity=100, error_rate=0.01)
+    other_worker.sync_with(TestingSessionLocal)
+    jti = jwt.get_unverified_claims(tokens["access_token"])["jti"]
+    assert other_worker.might_contain(jti)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_sync_catches_rows_that_commit_out_of_order(db):
+    worker = RevocationList(capacity=100, error_rate=0.01)
+    now = datetime.utcnow()
+    expires = now + timedelta(hours=1)
+    db.add(
+        models.RevokedAccessToken(
+            id=1_000_001, jti="sync-first", expires_at=expires, revoked_at=now
+        )
+    )
+    db.commit()
+    worker.sync_with(TestingSessionLocal)  # first sync rebuilds
+    worker.sync_with(TestingSessionLocal)
+
+    # Lower id, stamped earlier, but committed after the worker's last sync
+    db.add(
+        models.RevokedAccessToken(
+            id=1_000_000,
+            jti="sync-late",
+            expires_at=expires,
+            revoked_at=now - timedelta(seconds=10),
+        )
+    )
+    db.commit()
+    worker.sync_with(TestingSessionLocal)
+
+    assert worker.might_contain("sync-first")
+    assert worker.might_contain("sync-late")
@@ -0,0 +1,104 @@
+from datetime import date
+
+from sqlalchemy import func, select
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.tasks.rollups import rebuild_reading_rollups
+from tests.conftest import TestingSessionLocal
+from tests.test_books import register_and_login
+
+
+def _rollups(db, user_id: int):
+    db.expire_all()
+    rollup = models.ReadingDailyRollup
+    return {
+        (row.book_id, row.date.isoformat()): (row.pages, row.sessions)
+        for row in db.query(rollup).filter(rollup.user_id == user_id)
+    }
+
+
+def _from_logs(db, user_id: int):
+    log = models.ReadingLog
+    rows = db.execute(
+        select(log.book_id, log.date, func.sum(log.pages_read), func.count())
+        .where(log.user_id == user_id)
+        .group_by(log.book_id, log.date)
+    )
+    return {(book_id, day.isoformat()): (pages, sessions) for book_id, day, pages, sessions in rows}
+
+
+def test_log_writes_keep_rollups_in_step(client: TestClient, db):
+    token = register_and_login(client, "rollups@example.com", "rolluppassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+    first = client.post("/books", json={"title": "First"}, headers=headers).json()["id"]
+    second = client.post("/books", json={"title": "Second"}, headers=headers).json()["id"]
+
+    def log(book_id, pages, day):
+        return client.post(
+            "/reading-logs",
+            json={"book_id": book_id, "pages_read": pages, "date": day},
+            headers=headers,
+        ).json()["id"]
+
+    morning = log(first, 10, "2026-04-01")
+    log(first, 15, "2026-04-01")
+    moved = log(first, 20, "2026-04-02")
+    assert _rollups(db, user_id) == {
+        (first, "2026-04-01"): (25, 2),
+        (first, "2026-04-02"): (20, 1),
+    }
+
+    # Move a log to another book and day, change pages in place, delete one
+    client.put(
+        f"/reading-logs/{moved}",
+        json={"book_id": second, "date": "2026-04-03", "pages_read": 30},
+        headers=headers,
+    )
+    client.put(f"/reading-logs/{morning}", json={"pages_read": 12}, headers=headers)
+    assert _rollups(db, user_id) == {
+        (first, "2026-04-01"): (27, 2),
+        (second, "2026-04-03"): (30, 1),
+    }
+    client.delete(f"/reading-logs/{morning}", headers=headers)
+    assert _rollups(db, user_id) == _from_logs(db, user_id)
+
+    summary = client.get("/reading-logs/summary", headers=headers).json()
+    assert summary == {"total_pages_read": 45}
+    summary = client.get(
+        "/reading-logs/summary",
+        params={"book_id": first, "date_to": "2026-04-02"},
+        headers=headers,
+    ).json()
+    assert summary == {"total_pages_read": 15}
+
+    # Deleting the book takes its rollup rows along
+    client.delete(f"/books/{second}", headers=headers)
+    assert _rollups(db, user_id) == {(first, "2026-04-01"): (15, 1)}
+
+
+def test_rebuild_corrects_drift(client: TestClient, db):
+    token = register_and_login(client, "drift@example.com", "driftpassword")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+    book_id = client.post("/books", json={"title": "Drift"}, headers=headers).json()["id"]
+    for day in ("2026-05-01", "2026-05-02"):
+        client.post(
+            "/reading-logs",
+            json={"book_id": book_id, "pages_read": 8, "date": day},
+            headers=headers,
+        )
+    expected = _rollups(db, user_id)
+
+    # Out-of-band changes: one day lost, one wrong, one made up
+    rollup = models.ReadingDailyRollup
+    db.query(rollup).filter(rollup.user_id == user_id, rollup.date == date(2026, 5, 1)).delete()
+    db.query(rollup).filter(rollup.user_id == user_id).update({"pages": 99})
+    db.add(rollup(user_id=user_id, book_id=book_id, date=date(2026, 5, 9), pages=3, sessions=1))
+    db.commit()
+
+    assert rebuild_reading_rollups(TestingSessionLocal, user_id=user_id) == 3
+    assert _rollups(db, user_id) == expected
+    assert rebuild_reading_rollups(TestingSessionLocal) == 0
@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+
+from app.db.search import MARK_START, MARK_STOP, fts5_match, highlighted, search_terms
+from tests.test_books import register_and_login
+
+
+def _setup(client: TestClient, email: str):
+    token = register_and_login(client, email, "searchpassword")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_search_books_and_notes_scoped_to_user(client: TestClient):
+    headers = _setup(client, "search@example.com")
+    other = _setup(client, "search-other@example.com")
+
+    demian = client.post(
+        "/books", json={"title": "Demian", "author": "Hermann Hesse"}, headers=headers
+    ).json()
+    client.post("/books", json={"title": "Siddhartha", "author": "Hesse"}, headers=other)
+    log = client.post(
+        "/reading-logs",
+        json={
+            "book_id": demian["id"],
+            "pages_read": 30,
+            "date": "2026-02-01",
+            "note": "Sinclair <b>meets</b> Demian at school",
+        },
+        headers=headers,
+    ).json()
+
+    res = client.get("/search?q=hess", headers=headers)
+    assert res.status_code == 200, res.text
+    hits = res.json()
+    assert [(hit["kind"], hit["id"]) for hit in hits] == [("book", demian["id"])]
+    assert hits[0]["author"] == "Hermann <mark>Hesse</mark>"
+
+    hits = client.get("/search?q=demian", headers=headers).json()
+    kinds = {(hit["kind"], hit["id"]) for hit in hits}
+    assert kinds == {("book", demian["id"]), ("reading_log", log["id"])}
+    note_hit = next(hit for hit in hits if hit["kind"] == "reading_log")
+    assert note_hit["book_id"] == demian["id"]
+    assert note_hit["date"] == "2026-02-01"
+    assert "<mark>Demian</mark>" in note_hit["note"]
+    assert note_hit["note"].startswith("Sinclair &lt;b&gt;meets&lt;/b&gt; <mark>Demian</mark>")
+    # Title matches are weighted above note matches
+    assert hits[0]["kind"] == "book"
+
+    # Edits and deletes reach the index through the triggers
+    client.put(f"/books/{demian['id']}", json={"title": "Steppenwolf"}, headers=headers)
+    assert client.get("/search?q=steppen", headers=headers).json()[0]["id"] == demian["id"]
+    client.delete(f"/reading-logs/{log['id']}", headers=headers)
+    assert client.get("/search?q=sinclair", headers=headers).json() == []
+
+
+def test_search_cursor_pages(client: TestClient):
+    headers = _setup(client, "search-pages@example.com")
+    ids = {
+        client.post("/books", json={"title": f"Pagination volume {i}"}, headers=headers).json()["id"]
+        for i in range(5)
+    }
+
+    seen = []
+    url = "/search?q=pagination&limit=2"
+    while url:
+        res = client.get(url, headers=headers)
+        seen.extend(hit["id"] for hit in res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+        url = f"/search?q=pagination&limit=2&cursor={cursor}" if cursor else None
+
+    assert len(seen) == 5
+    assert set(seen) == ids
+
+
+def test_query_syntax_is_not_interpreted():
+    assert search_terms('title:"x" OR NEAR(a b)*') == ["title", "x", "or", "near", "a", "b"]
+    assert fts5_match(7, ["or"]) == 'owner:"u7" AND {title author note}: ("or"*)'
+
+
+def test_highlights_escape_the_source_text():
+    fragment = f'<img src=x onerror="alert(1)"> & {MARK_START}Demian{MARK_STOP}'
+    assert highlighted(fragment) == (
+        '&lt;img src=x onerror="alert(1)"&gt; &amp; <mark>Demian</mark>'
+    )
+    assert highlighted(None) is None
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from app import models
+from app.core.security import create_refresh_token, hash_refresh_token
+from app.tasks.tokens import purge_refresh_tokens
+from tests.conftest import TestingSessionLocal
+
+
+def test_purge_removes_only_stale_tokens(db):
+    user = models.User(email="purge@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+
+    now = datetime.utcnow()
+    long_ago = now - timedelta(days=30)
+
+    def token(**kwargs):
+        return models.RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(create_refresh_token()),
+            **kwargs,
+        )
+
+    live = token(expires_at=now + timedelta(days=1))
+    db.add_all([
+        live,
+        token(expires_at=long_ago),
+        token(expires_at=now + timedelta(days=1), revoked_at=long_ago),
+        token(expires_at=long_ago, revoked_at=long_ago),
+    ])
+    db.commit()
+
+    deleted = purge_refresh_tokens(
+        TestingSessionLocal, retention_days=7, batch_size=2, pause_seconds=0
+    )
+    assert deleted == 3
+
+    remaining = db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user.id
+    ).all()
+    assert [t.id for t in remaining] == [live.id]
+    assert len(remaining[0].token_hash) == 32